@@ -2,30 +2,125 @@
 Functions for analyzing and summarizing results
 """
 
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 from scipy import stats
 import config
 
+# Summaries keyed by a digest of the result arrays; results are immutable
+# once a simulation finishes, so repeated dashboard hits reuse the cache
+_summary_cache = {}
+_SUMMARY_CACHE_MAX = 32
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _pooled_stats(a, b):
+    """
+    Compute mean difference and pooled standard deviation in one fused pass
+
+    Parameters:
+    a (numpy.ndarray): First sample (float64)
+    b (numpy.ndarray): Second sample (float64)
+
+    Returns:
+    tuple: (mean difference, pooled standard deviation)
+    """
+    n1 = a.shape[0]
+    n2 = b.shape[0]
+    sa = 0.0
+    sa2 = 0.0
+    for i in range(n1):
+        sa += a[i]
+        sa2 += a[i] * a[i]
+    sb = 0.0
+    sb2 = 0.0
+    for j in range(n2):
+        sb += b[j]
+        sb2 += b[j] * b[j]
+    mean_a = sa / n1
+    mean_b = sb / n2
+    # Pool the sums of squared deviations directly; weighting biased
+    # (ddof=0) variances by (n-1) would understate the pooled SD when
+    # sample sizes differ
+    ss_a = sa2 - n1 * mean_a * mean_a
+    ss_b = sb2 - n2 * mean_b * mean_b
+    pooled_std = np.sqrt((ss_a + ss_b) / (n1 + n2 - 2))
+    return mean_a - mean_b, pooled_std
+
+def _summary_kernel(failures, systemic):
+    """
+    Fused single-pass summary over the SoA result buffers
+
+    Parameters:
+    failures (numpy.ndarray): Failure counts per simulation (int32)
+    systemic (numpy.ndarray): Systemic event flags per simulation (uint8)
+
+    Returns:
+    tuple: (mean failures, max failures, std dev failures, P(systemic event))
+    """
+    n = failures.shape[0]
+    total = 0.0
+    total_sq = 0.0
+    max_failures = failures[0]
+    systemic_count = 0.0
+    for i in range(n):
+        x = float(failures[i])
+        total += x
+        total_sq += x * x
+        if failures[i] > max_failures:
+            max_failures = failures[i]
+        systemic_count += systemic[i]
+    mean = total / n
+    var = total_sq / n - mean * mean
+    if var < 0.0:
+        var = 0.0
+    return mean, max_failures, np.sqrt(var), systemic_count / n
+
+# JIT-compile the kernels when numba is available; the pure-Python
+# versions above are used as a fallback otherwise
+if njit is not None:
+    _pooled_stats = njit(fastmath=True, cache=True)(_pooled_stats)
+    _summary_kernel = njit(fastmath=True, cache=True)(_summary_kernel)
+
 def summarize_results(results):
     """
     Summarize the simulation results
     
     Parameters:
-    results (list): List of tuples (number of failures, systemic event boolean, failed banks)
-    
+    results (list or numpy.ndarray): List of tuples (number of failures, systemic event
+        boolean, failed banks) or a pre-stacked array with those columns
+
     Returns:
     dict: Summary statistics
     """
-    failures = [r[0] for r in results]
-    systemic_events = [r[1] for r in results]
-    
-    return {
-        'Average Failures': np.mean(failures),
-        'Max Failures': np.max(failures),
-        'Std Dev Failures': np.std(failures),
-        'Probability Systemic Event': np.mean(systemic_events)
-    }
+    if isinstance(results, np.ndarray):
+        failures = results[:, 0].astype(np.int32)
+        systemic_events = results[:, 1].astype(np.uint8)
+    else:
+        # Extract compact SoA buffers in one C-level pass per column
+        failures = np.fromiter((r[0] for r in results), dtype=np.int32, count=len(results))
+        systemic_events = np.fromiter((r[1] for r in results), dtype=np.uint8, count=len(results))
+
+    cache_key = (failures.tobytes(), systemic_events.tobytes())
+    summary = _summary_cache.get(cache_key)
+    if summary is None:
+        mean, max_failures, std_dev, p_systemic = _summary_kernel(failures, systemic_events)
+        summary = {
+            'Average Failures': mean,
+            'Max Failures': int(max_failures),
+            'Std Dev Failures': std_dev,
+            'Probability Systemic Event': p_systemic
+        }
+        if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+            _summary_cache.clear()
+        _summary_cache[cache_key] = summary
+
+    return dict(summary)
 
 def calculate_improvements(trad_summary, bc_summary):
     """
@@ -38,48 +133,92 @@ def calculate_improvements(trad_summary, bc_summary):
     Returns:
     dict: Improvement metrics
     """
-    return {
-        'Average Failures': (1 - bc_summary['Average Failures'] / trad_summary['Average Failures']) * 100 
-            if trad_summary['Average Failures'] > 0 else 0,
-        'Max Failures': trad_summary['Max Failures'] - bc_summary['Max Failures'],
-        'Probability Systemic Event': (1 - bc_summary['Probability Systemic Event'] / trad_summary['Probability Systemic Event']) * 100 
-            if trad_summary['Probability Systemic Event'] > 0 else 0,
-        'Std Dev Failures': (1 - bc_summary['Std Dev Failures'] / trad_summary['Std Dev Failures']) * 100 
-            if trad_summary['Std Dev Failures'] > 0 else 0
-    }
+    return dict(_cached_improvements(tuple(sorted(trad_summary.items())),
+                                     tuple(sorted(bc_summary.items()))))
+
+@lru_cache(maxsize=32)
+def _cached_improvements(trad_items, bc_items):
+    """Memoized improvement calculation over hashable summary items"""
+    trad_summary = dict(trad_items)
+    bc_summary = dict(bc_items)
+
+    # Compute the three percentage-reduction metrics in one NumPy op
+    # instead of three guarded scalar expressions
+    ratio_keys = ('Average Failures', 'Probability Systemic Event', 'Std Dev Failures')
+    trad = np.array([trad_summary[k] for k in ratio_keys], dtype=np.float64)
+    bc = np.array([bc_summary[k] for k in ratio_keys], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reductions = np.where(trad > 0, (1 - bc / trad) * 100, 0.0)
+
+    improvements = dict(zip(ratio_keys, reductions.tolist()))
+    # Max failures is an absolute difference, not a ratio
+    improvements['Max Failures'] = trad_summary['Max Failures'] - bc_summary['Max Failures']
+    return improvements
 
 def create_results_table(trad_summary, bc_summary, improvements):
     """
-    Create a results table comparing traditional and blockchain systems
-    
+    Collect comparison metrics for traditional and blockchain systems
+
     Parameters:
     trad_summary (dict): Summary statistics for traditional banking
     bc_summary (dict): Summary statistics for blockchain banking
     improvements (dict): Improvement metrics
-    
+
+    Returns:
+    dict: Numeric table data, one list per column
+    """
+    return {
+        'metrics': ['Average Failures', 'Maximum Failures',
+                    'Std Dev Failures', 'Probability Systemic Event (%)'],
+        'traditional': [
+            trad_summary['Average Failures'],
+            trad_summary['Max Failures'],
+            trad_summary['Std Dev Failures'],
+            trad_summary['Probability Systemic Event'] * 100
+        ],
+        'blockchain': [
+            bc_summary['Average Failures'],
+            bc_summary['Max Failures'],
+            bc_summary['Std Dev Failures'],
+            bc_summary['Probability Systemic Event'] * 100
+        ],
+        'improvements': [
+            improvements['Average Failures'],
+            improvements['Max Failures'],
+            improvements['Std Dev Failures'],
+            improvements['Probability Systemic Event']
+        ]
+    }
+
+def format_results_table(table_data):
+    """
+    Format numeric table data as a human-readable results table
+
+    String formatting only happens here, once per render, instead of on
+    every table rebuild
+
+    Parameters:
+    table_data (dict): Numeric table data from create_results_table
+
     Returns:
     pandas.DataFrame: Results table
     """
+    trad = table_data['traditional']
+    bc = table_data['blockchain']
+    imp = table_data['improvements']
     return pd.DataFrame({
-        'Metric': ['Average Failures', 'Maximum Failures', 
-                  'Std Dev Failures', 'Probability Systemic Event (%)'],
+        'Metric': table_data['metrics'],
         'Traditional': [
-            f"{trad_summary['Average Failures']:.4f}",
-            f"{trad_summary['Max Failures']:.0f}",
-            f"{trad_summary['Std Dev Failures']:.4f}",
-            f"{trad_summary['Probability Systemic Event']*100:.4f}%"
+            f"{trad[0]:.4f}", f"{trad[1]:.0f}", f"{trad[2]:.4f}", f"{trad[3]:.4f}%"
         ],
         'Blockchain': [
-            f"{bc_summary['Average Failures']:.4f}",
-            f"{bc_summary['Max Failures']:.0f}",
-            f"{bc_summary['Std Dev Failures']:.4f}",
-            f"{bc_summary['Probability Systemic Event']*100:.4f}%"
+            f"{bc[0]:.4f}", f"{bc[1]:.0f}", f"{bc[2]:.4f}", f"{bc[3]:.4f}%"
         ],
         'Improvement': [
-            f"{improvements['Average Failures']:.2f}% reduction" if improvements['Average Failures'] > 0 else "No improvement",
-            f"{improvements['Max Failures']:.0f} fewer failures" if improvements['Max Failures'] > 0 else "No improvement",
-            f"{improvements['Std Dev Failures']:.2f}% lower volatility" if improvements['Std Dev Failures'] > 0 else "No improvement",
-            f"{improvements['Probability Systemic Event']:.2f}% lower probability" if improvements['Probability Systemic Event'] > 0 else "No improvement"
+            f"{imp[0]:.2f}% reduction" if imp[0] > 0 else "No improvement",
+            f"{imp[1]:.0f} fewer failures" if imp[1] > 0 else "No improvement",
+            f"{imp[2]:.2f}% lower volatility" if imp[2] > 0 else "No improvement",
+            f"{imp[3]:.2f}% lower probability" if imp[3] > 0 else "No improvement"
         ]
     })
 
@@ -94,17 +233,14 @@ def perform_statistical_analysis(trad_results, bc_results):
     Returns:
     tuple: (t_statistic, p_value, cohens_d, effect_interpretation)
     """
-    trad_failures = [r[0] for r in trad_results]
-    bc_failures = [r[0] for r in bc_results]
-    
-    # T-test
+    trad_failures = np.fromiter((r[0] for r in trad_results), dtype=np.float64, count=len(trad_results))
+    bc_failures = np.fromiter((r[0] for r in bc_results), dtype=np.float64, count=len(bc_results))
+
+    # T-test (scipy cannot be called from the jitted kernel)
     t_stat, p_value = stats.ttest_ind(trad_failures, bc_failures)
-    
+
     # Cohen's d for effect size
-    mean_diff = np.mean(trad_failures) - np.mean(bc_failures)
-    pooled_std = np.sqrt(((len(trad_failures) - 1) * np.var(trad_failures) + 
-                         (len(bc_failures) - 1) * np.var(bc_failures)) / 
-                        (len(trad_failures) + len(bc_failures) - 2))
+    mean_diff, pooled_std = _pooled_stats(trad_failures, bc_failures)
     cohens_d = mean_diff / pooled_std if pooled_std > 0 else 0
     
     # Interpret effect size
@@ -8,25 +8,83 @@ from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt
 )
 from werkzeug.security import generate_password_hash, check_password_hash
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+import hmac
+import os
 import re
-from backend.models.user import User
+import secrets
+from backend.models.user import User, RevokedToken
 from backend.app import db, jwt
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
 auth_bp = Blueprint('auth', __name__)
 
-# Email validation regex
-EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+# Redis-backed JTI blocklist: in-memory lookup on every authenticated
+# request instead of a DB hop; entries expire with the token so memory
+# stays bounded. The RevokedToken table remains the durable fallback.
+_redis_client = redis.Redis.from_url(
+    os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+) if redis is not None else None
+
+# Dedicated pool for the deliberately slow KDF work; caps concurrent
+# hashing at the core count so bursts of account requests don't pile
+# CPU-bound hashing onto every request thread at once
+_hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix='pwhash')
+
+def _hash_password(password):
+    """Hash a password on the hashing pool"""
+    return _hash_pool.submit(generate_password_hash, password).result()
+
+# Verification results cached per (hash, password) pair so repeated
+# logins from the same client pay pbkdf2 once per process. Keys are
+# HMACs under a per-process random key, so neither plaintext passwords
+# nor anything derivable from them sits in memory. Bounded at 1024
+# entries, evicting the oldest first.
+_verify_cache = {}
+_VERIFY_CACHE_MAX = 1024
+_verify_cache_key = secrets.token_bytes(32)
+
+def _check_password(password_hash, password):
+    """Verify a password against its hash on the hashing pool"""
+    key = hmac.new(_verify_cache_key,
+                   f'{password_hash}:{password}'.encode(), 'sha256').digest()
+    cached = _verify_cache.get(key)
+    if cached is not None:
+        return cached
+    valid = _hash_pool.submit(check_password_hash, password_hash, password).result()
+    if len(_verify_cache) >= _VERIFY_CACHE_MAX:
+        _verify_cache.pop(next(iter(_verify_cache)))
+    _verify_cache[key] = valid
+    return valid
 
-# Password validation regex (min 8 chars, at least one letter and one number)
-PASSWORD_REGEX = r'^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$'
+# Email validation regex (compiled once at import)
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+def _valid_password(password):
+    """Check password strength (min 8 chars, at least one letter and one number)
+
+    Single O(n) scan; the regex lookahead equivalent walks the string twice.
+    """
+    return (len(password) >= 8 and password.isalnum()
+            and any(c.isdigit() for c in password)
+            and any(c.isalpha() for c in password))
 
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
     """Check if token is revoked"""
     jti = jwt_payload["jti"]
-    token = User.query.filter_by(revoked_tokens=jti).first()
-    return token is not None
+    if _redis_client is not None:
+        try:
+            return _redis_client.exists(f'revoked:{jti}') == 1
+        except redis.RedisError:
+            pass
+    # Primary-key lookup on the blocklist table instead of scanning users
+    return db.session.get(RevokedToken, jti) is not None
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -40,29 +98,33 @@ def register():
             return jsonify({"error": {"message": f"Missing required field: {field}"}}), 400
     
     # Validate email format
-    if not re.match(EMAIL_REGEX, data['email']):
+    if not EMAIL_RE.match(data['email']):
         return jsonify({"error": {"message": "Invalid email format"}}), 400
     
     # Validate password strength
-    if not re.match(PASSWORD_REGEX, data['password']):
+    if not _valid_password(data['password']):
         return jsonify({
             "error": {
                 "message": "Password must be at least 8 characters long and contain at least one letter and one number"
             }
         }), 400
     
-    # Check if user already exists
-    if User.query.filter_by(username=data['username']).first():
+    # Check if user already exists (single round trip for both checks)
+    existing = db.session.query(User.username, User.email).filter(
+        (User.username == data['username']) | (User.email == data['email'])
+    ).all()
+
+    if any(row.username == data['username'] for row in existing):
         return jsonify({"error": {"message": "Username already exists"}}), 409
-    
-    if User.query.filter_by(email=data['email']).first():
+
+    if any(row.email == data['email'] for row in existing):
         return jsonify({"error": {"message": "Email already exists"}}), 409
     
     # Create new user
     new_user = User(
         username=data['username'],
         email=data['email'],
-        password_hash=generate_password_hash(data['password']),
+        password_hash=_hash_password(data['password']),
         role='viewer'  # Default role
     )
     
@@ -92,11 +154,12 @@ def login():
     user = User.query.filter_by(username=data['username']).first()
     
     # Check if user exists and password is correct
-    if not user or not check_password_hash(user.password_hash, data['password']):
+    if not user or not _check_password(user.password_hash, data['password']):
         return jsonify({"error": {"message": "Invalid username or password"}}), 401
     
-    # Create tokens
-    access_token = create_access_token(identity=user.id)
+    # Create tokens with the role embedded so endpoints can authorize
+    # from claims instead of re-querying the user
+    access_token = create_access_token(identity=user.id, additional_claims={'role': user.role})
     refresh_token = create_refresh_token(identity=user.id)
     
     # Update last login timestamp
@@ -119,7 +182,11 @@ def login():
 def refresh():
     """Refresh access token"""
     current_user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id)
+    user = User.query.get(current_user_id)
+    new_access_token = create_access_token(
+        identity=current_user_id,
+        additional_claims={'role': user.role} if user else None
+    )
     
     return jsonify({"access_token": new_access_token}), 200
 
@@ -127,14 +194,21 @@ def refresh():
 @jwt_required()
 def logout():
     """Logout user (revoke current token)"""
-    jti = get_jwt()["jti"]
+    token = get_jwt()
+    jti = token["jti"]
     user_id = get_jwt_identity()
-    
-    # Add token to revoked tokens list
-    user = User.query.get(user_id)
-    if user:
-        user.add_revoked_token(jti)
-        db.session.commit()
+
+    # Expire the Redis entry with the token itself
+    if _redis_client is not None:
+        ttl = max(int(token["exp"] - datetime.now(timezone.utc).timestamp()), 1)
+        try:
+            _redis_client.setex(f'revoked:{jti}', ttl, '1')
+        except redis.RedisError:
+            current_app.logger.warning("Redis unavailable, falling back to DB blocklist")
+
+    # Add token to the durable revoked tokens blocklist
+    db.session.add(RevokedToken(jti=jti, user_id=user_id))
+    db.session.commit()
     
     return jsonify({"message": "Successfully logged out"}), 200
 
@@ -169,7 +243,7 @@ def reset_password(token):
         return jsonify({"error": {"message": "New password is required"}}), 400
     
     # Validate password strength
-    if not re.match(PASSWORD_REGEX, data['password']):
+    if not _valid_password(data['password']):
         return jsonify({
             "error": {
                 "message": "Password must be at least 8 characters long and contain at least one letter and one number"
@@ -183,7 +257,7 @@ def reset_password(token):
         return jsonify({"error": {"message": "Invalid or expired reset token"}}), 400
     
     # Update password
-    user.password_hash = generate_password_hash(data['password'])
+    user.password_hash = _hash_password(data['password'])
     user.reset_token = None
     user.reset_token_expires_at = None
     db.session.commit()
@@ -228,11 +302,11 @@ def change_password():
         return jsonify({"error": {"message": "Current password and new password are required"}}), 400
     
     # Verify current password
-    if not check_password_hash(user.password_hash, data['current_password']):
+    if not _check_password(user.password_hash, data['current_password']):
         return jsonify({"error": {"message": "Current password is incorrect"}}), 401
     
     # Validate password strength
-    if not re.match(PASSWORD_REGEX, data['new_password']):
+    if not _valid_password(data['new_password']):
         return jsonify({
             "error": {
                 "message": "Password must be at least 8 characters long and contain at least one letter and one number"
@@ -240,7 +314,7 @@ def change_password():
         }), 400
     
     # Update password
-    user.password_hash = generate_password_hash(data['new_password'])
+    user.password_hash = _hash_password(data['new_password'])
     db.session.commit()
     
     return jsonify({"message": "Password changed successfully"}), 200
\ No newline at end of file
@@ -2,17 +2,33 @@
 Banks API endpoints
 """
 
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt
 from backend.models.bank import Bank
-from backend.models.user import User
 from backend.app import db
 import csv
 import io
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 banks_bp = Blueprint('banks', __name__)
 
+# Exposure-matrix responses keyed by a bank-table version token; any
+# mutation bumps the version so reads recompute at most once per change
+_exposure_cache = {}
+_bank_version = 0
+
+def _bump_bank_version():
+    """Invalidate the cached exposure matrix after a bank mutation"""
+    global _bank_version
+    _bank_version += 1
+    _exposure_cache.clear()
+
 def validate_bank_data(data, is_update=False):
     """
     Validate bank data
@@ -22,14 +38,17 @@ def validate_bank_data(data, is_update=False):
         is_update (bool): Whether this is an update operation
         
     Returns:
-        tuple: (is_valid, error_message)
+        tuple: (is_valid, error_message, parsed_values) where parsed_values
+            holds the already-coerced floats so callers don't reparse
     """
     # For updates, we don't need to validate all fields
     if not is_update:
         required_fields = ['name', 'cet1_ratio', 'total_assets', 'interbank_assets', 'interbank_liabilities']
         for field in required_fields:
             if field not in data:
-                return False, f"Missing required field: {field}"
+                return False, f"Missing required field: {field}", None
+    
+    parsed = {'name': data['name']} if 'name' in data else {}
     
     # Validate numeric fields if present
     numeric_fields = ['cet1_ratio', 'total_assets', 'interbank_assets', 'interbank_liabilities', 'capital_buffer']
@@ -39,19 +58,20 @@ def validate_bank_data(data, is_update=False):
                 value = float(data[field])
                 # Check for negative values
                 if value < 0:
-                    return False, f"{field} cannot be negative"
+                    return False, f"{field} cannot be negative", None
+                parsed[field] = value
             except (ValueError, TypeError):
-                return False, f"{field} must be a number"
+                return False, f"{field} must be a number", None
     
-    # Additional validation rules
-    if 'cet1_ratio' in data and float(data['cet1_ratio']) > 100:
-        return False, "CET1 ratio cannot exceed 100%"
+    # Additional validation rules on the parsed values
+    if parsed.get('cet1_ratio', 0) > 100:
+        return False, "CET1 ratio cannot exceed 100%", None
     
-    if 'interbank_assets' in data and 'total_assets' in data:
-        if float(data['interbank_assets']) > float(data['total_assets']):
-            return False, "Interbank assets cannot exceed total assets"
+    if 'interbank_assets' in parsed and 'total_assets' in parsed:
+        if parsed['interbank_assets'] > parsed['total_assets']:
+            return False, "Interbank assets cannot exceed total assets", None
     
-    return True, None
+    return True, None, parsed
 
 @banks_bp.route('', methods=['GET'])
 @jwt_required()
@@ -61,29 +81,29 @@ def get_banks():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 10, type=int), 100)  # Limit max per_page
     
-    # Apply filters if provided
-    query = Bank.query
-    
+    # Select only the serialized columns instead of hydrating full ORM objects
+    columns = ('id', 'name', 'cet1_ratio', 'total_assets',
+               'interbank_assets', 'interbank_liabilities', 'capital_buffer')
+    query = db.session.query(*(getattr(Bank, column) for column in columns))
+
     if 'search' in request.args:
         search_term = f"%{request.args['search']}%"
         query = query.filter(Bank.name.ilike(search_term))
-    
+
     # Apply sorting
     sort_by = request.args.get('sort_by', 'name')
     sort_dir = request.args.get('sort_dir', 'asc')
-    
+
     if sort_dir == 'desc':
         query = query.order_by(getattr(Bank, sort_by).desc())
     else:
         query = query.order_by(getattr(Bank, sort_by).asc())
-    
+
     # Paginate results
     paginated = query.paginate(page=page, per_page=per_page)
-    
+
     # Format response
-    banks = []
-    for bank in paginated.items:
-        banks.append(bank.to_dict())
+    banks = [dict(zip(columns, row)) for row in paginated.items]
     
     return jsonify({
         "banks": banks,
@@ -110,17 +130,14 @@ def get_bank(bank_id):
 @jwt_required()
 def create_bank():
     """Create a new bank"""
-    current_user_id = get_jwt_identity()
-    
-    # Check if user has admin role
-    user = User.query.get(current_user_id)
-    if user.role != 'admin':
+    # Check the role claim embedded in the JWT instead of re-querying the user
+    if get_jwt().get('role') != 'admin':
         return jsonify({"error": {"message": "Only administrators can create banks"}}), 403
     
     data = request.get_json()
     
     # Validate bank data
-    is_valid, error_message = validate_bank_data(data)
+    is_valid, error_message, parsed = validate_bank_data(data)
     if not is_valid:
         return jsonify({"error": {"message": error_message}}), 400
     
@@ -128,23 +145,24 @@ def create_bank():
     if Bank.query.filter_by(name=data['name']).first():
         return jsonify({"error": {"message": "Bank with this name already exists"}}), 409
     
-    # Create new bank
+    # Create new bank from the values the validator already parsed
     new_bank = Bank(
-        name=data['name'],
-        cet1_ratio=float(data['cet1_ratio']),
-        total_assets=float(data['total_assets']),
-        interbank_assets=float(data['interbank_assets']),
-        interbank_liabilities=float(data['interbank_liabilities'])
+        name=parsed['name'],
+        cet1_ratio=parsed['cet1_ratio'],
+        total_assets=parsed['total_assets'],
+        interbank_assets=parsed['interbank_assets'],
+        interbank_liabilities=parsed['interbank_liabilities']
     )
     
     # Calculate capital buffer if not provided
-    if 'capital_buffer' not in data:
+    if 'capital_buffer' not in parsed:
         new_bank.capital_buffer = new_bank.cet1_ratio * new_bank.total_assets * 0.01
     else:
-        new_bank.capital_buffer = float(data['capital_buffer'])
+        new_bank.capital_buffer = parsed['capital_buffer']
     
     db.session.add(new_bank)
     db.session.commit()
+    _bump_bank_version()
     
     return jsonify({
         "message": "Bank created successfully",
@@ -155,11 +173,8 @@ def create_bank():
 @jwt_required()
 def update_bank(bank_id):
     """Update a bank"""
-    current_user_id = get_jwt_identity()
-    
-    # Check if user has admin role
-    user = User.query.get(current_user_id)
-    if user.role != 'admin':
+    # Check the role claim embedded in the JWT instead of re-querying the user
+    if get_jwt().get('role') != 'admin':
         return jsonify({"error": {"message": "Only administrators can update banks"}}), 403
     
     bank = Bank.query.get(bank_id)
@@ -170,33 +185,33 @@ def update_bank(bank_id):
     data = request.get_json()
     
     # Validate bank data
-    is_valid, error_message = validate_bank_data(data, is_update=True)
+    is_valid, error_message, parsed = validate_bank_data(data, is_update=True)
     if not is_valid:
         return jsonify({"error": {"message": error_message}}), 400
     
-    # Update fields
-    if 'name' in data:
+    # Update fields from the values the validator already parsed
+    if 'name' in parsed:
         # Check if name is already taken by another bank
-        existing_bank = Bank.query.filter_by(name=data['name']).first()
+        existing_bank = Bank.query.filter_by(name=parsed['name']).first()
         if existing_bank and existing_bank.id != bank.id:
             return jsonify({"error": {"message": "Bank with this name already exists"}}), 409
-        bank.name = data['name']
+        bank.name = parsed['name']
     
-    if 'cet1_ratio' in data:
-        bank.cet1_ratio = float(data['cet1_ratio'])
+    if 'cet1_ratio' in parsed:
+        bank.cet1_ratio = parsed['cet1_ratio']
     
-    if 'total_assets' in data:
-        bank.total_assets = float(data['total_assets'])
+    if 'total_assets' in parsed:
+        bank.total_assets = parsed['total_assets']
     
-    if 'interbank_assets' in data:
-        bank.interbank_assets = float(data['interbank_assets'])
+    if 'interbank_assets' in parsed:
+        bank.interbank_assets = parsed['interbank_assets']
     
-    if 'interbank_liabilities' in data:
-        bank.interbank_liabilities = float(data['interbank_liabilities'])
+    if 'interbank_liabilities' in parsed:
+        bank.interbank_liabilities = parsed['interbank_liabilities']
     
-    if 'capital_buffer' in data:
-        bank.capital_buffer = float(data['capital_buffer'])
-    elif 'cet1_ratio' in data or 'total_assets' in data:
+    if 'capital_buffer' in parsed:
+        bank.capital_buffer = parsed['capital_buffer']
+    elif 'cet1_ratio' in parsed or 'total_assets' in parsed:
         # Recalculate capital buffer if CET1 ratio or total assets changed
         bank.capital_buffer = bank.cet1_ratio * bank.total_assets * 0.01
     
@@ -205,6 +220,7 @@ def update_bank(bank_id):
         return jsonify({"error": {"message": "Interbank assets cannot exceed total assets"}}), 400
     
     db.session.commit()
+    _bump_bank_version()
     
     return jsonify({
         "message": "Bank updated successfully",
@@ -215,11 +231,8 @@ def update_bank(bank_id):
 @jwt_required()
 def delete_bank(bank_id):
     """Delete a bank"""
-    current_user_id = get_jwt_identity()
-    
-    # Check if user has admin role
-    user = User.query.get(current_user_id)
-    if user.role != 'admin':
+    # Check the role claim embedded in the JWT instead of re-querying the user
+    if get_jwt().get('role') != 'admin':
         return jsonify({"error": {"message": "Only administrators can delete banks"}}), 403
     
     bank = Bank.query.get(bank_id)
@@ -229,6 +242,7 @@ def delete_bank(bank_id):
     
     db.session.delete(bank)
     db.session.commit()
+    _bump_bank_version()
     
     return jsonify({
         "message": "Bank deleted successfully"
@@ -238,11 +252,8 @@ def delete_bank(bank_id):
 @jwt_required()
 def import_banks():
     """Import banks from CSV file"""
-    current_user_id = get_jwt_identity()
-    
-    # Check if user has admin role
-    user = User.query.get(current_user_id)
-    if user.role != 'admin':
+    # Check the role claim embedded in the JWT instead of re-querying the user
+    if get_jwt().get('role') != 'admin':
         return jsonify({"error": {"message": "Only administrators can import banks"}}), 403
     
     if 'file' not in request.files:
@@ -258,75 +269,59 @@ def import_banks():
     
     # Read CSV file
     try:
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        banks_created = 0
-        banks_updated = 0
+        # Let pandas' C parser read the upload stream in chunks; buffering
+        # the file into an intermediate str/bytes would double peak memory
+        df = pd.read_csv(file.stream, encoding='utf-8')
+        df = df.rename(columns={
+            'Bank Name': 'name',
+            'CET1 Ratio (%)': 'cet1_ratio',
+            'Total Assets (€B)': 'total_assets',
+            'Interbank Assets (€B)': 'interbank_assets',
+            'Interbank Liabilities (€B)': 'interbank_liabilities',
+            'Capital Buffer (€B)': 'capital_buffer'
+        })
+
+        if 'capital_buffer' not in df.columns:
+            df['capital_buffer'] = df['cet1_ratio'] * df['total_assets'] * 0.01
+
+        # Load existing bank ids in one query instead of one lookup per row
+        existing = {name: bank_id for bank_id, name in db.session.query(Bank.id, Bank.name).all()}
+
+        to_insert = []
+        to_update = []
         errors = []
-        
-        for row in csv_reader:
+
+        for row_data in df.to_dict(orient='records'):
             try:
-                # Validate row data
-                row_data = {
-                    'name': row['Bank Name'],
-                    'cet1_ratio': float(row['CET1 Ratio (%)']),
-                    'total_assets': float(row['Total Assets (€B)']),
-                    'interbank_assets': float(row['Interbank Assets (€B)']),
-                    'interbank_liabilities': float(row['Interbank Liabilities (€B)'])
-                }
-                
-                if 'Capital Buffer (€B)' in row:
-                    row_data['capital_buffer'] = float(row['Capital Buffer (€B)'])
-                
-                is_valid, error_message = validate_bank_data(row_data)
+                is_valid, error_message, parsed = validate_bank_data(row_data)
                 if not is_valid:
-                    errors.append(f"Error in row for {row['Bank Name']}: {error_message}")
+                    errors.append(f"Error in row for {row_data['name']}: {error_message}")
                     continue
-                
-                # Check if bank already exists
-                bank = Bank.query.filter_by(name=row['Bank Name']).first()
-                
-                if bank:
-                    # Update existing bank
-                    bank.cet1_ratio = float(row['CET1 Ratio (%)'])
-                    bank.total_assets = float(row['Total Assets (€B)'])
-                    bank.interbank_assets = float(row['Interbank Assets (€B)'])
-                    bank.interbank_liabilities = float(row['Interbank Liabilities (€B)'])
-                    
-                    if 'Capital Buffer (€B)' in row:
-                        bank.capital_buffer = float(row['Capital Buffer (€B)'])
-                    else:
-                        bank.capital_buffer = bank.cet1_ratio * bank.total_assets * 0.01
-                    
-                    banks_updated += 1
+
+                # Reuse the validator's coerced values instead of reparsing
+                bank_id = existing.get(parsed['name'])
+                if bank_id:
+                    parsed['id'] = bank_id
+                    to_update.append(parsed)
                 else:
-                    # Create new bank
-                    new_bank = Bank(
-                        name=row['Bank Name'],
-                        cet1_ratio=float(row['CET1 Ratio (%)']),
-                        total_assets=float(row['Total Assets (€B)']),
-                        interbank_assets=float(row['Interbank Assets (€B)']),
-                        interbank_liabilities=float(row['Interbank Liabilities (€B)'])
-                    )
-                    
-                    if 'Capital Buffer (€B)' in row:
-                        new_bank.capital_buffer = float(row['Capital Buffer (€B)'])
-                    else:
-                        new_bank.capital_buffer = new_bank.cet1_ratio * new_bank.total_assets * 0.01
-                    
-                    db.session.add(new_bank)
-                    banks_created += 1
-            
+                    to_insert.append(parsed)
+
             except Exception as e:
-                errors.append(f"Error processing row for {row.get('Bank Name', 'unknown')}: {str(e)}")
-        
+                errors.append(f"Error processing row for {row_data.get('name', 'unknown')}: {str(e)}")
+
+        # Batched writes instead of per-row session adds
+        if to_insert:
+            db.session.bulk_insert_mappings(Bank, to_insert)
+        if to_update:
+            db.session.bulk_update_mappings(Bank, to_update)
+
         db.session.commit()
-        
+        _bump_bank_version()
+
         return jsonify({
             "message": "Banks imported successfully",
-            "created": banks_created,
-            "updated": banks_updated,
+            "created": len(to_insert),
+            "updated": len(to_update),
             "errors": errors
         }), 200
     
@@ -337,64 +332,78 @@ def import_banks():
 @jwt_required()
 def export_banks():
     """Export banks to CSV file"""
-    banks = Bank.query.all()
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Bank Name', 'CET1 Ratio (%)', 'Total Assets (€B)', 
-                    'Interbank Assets (€B)', 'Interbank Liabilities (€B)', 
-                    'Capital Buffer (€B)'])
-    
-    # Write data
-    for bank in banks:
-        writer.writerow([
-            bank.name,
-            bank.cet1_ratio,
-            bank.total_assets,
-            bank.interbank_assets,
-            bank.interbank_liabilities,
-            bank.capital_buffer
-        ])
-    
-    # Prepare response
-    output.seek(0)
-    return output.getvalue(), 200, {
-        'Content-Type': 'text/csv',
+    # Stream lightweight column tuples instead of materializing every
+    # Bank ORM object and the full CSV text in memory
+    query = db.session.query(
+        Bank.name, Bank.cet1_ratio, Bank.total_assets,
+        Bank.interbank_assets, Bank.interbank_liabilities, Bank.capital_buffer
+    ).yield_per(1000)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(['Bank Name', 'CET1 Ratio (%)', 'Total Assets (€B)',
+                        'Interbank Assets (€B)', 'Interbank Liabilities (€B)',
+                        'Capital Buffer (€B)'])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+        for row in query:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    # The generator walks the query lazily, after this view returns;
+    # stream_with_context keeps the app context alive for those reads
+    return Response(stream_with_context(generate()), mimetype='text/csv', headers={
         'Content-Disposition': 'attachment; filename=banks.csv'
-    }
+    })
 
 @banks_bp.route('/exposure-matrix', methods=['GET'])
 @jwt_required()
 def get_exposure_matrix():
     """Get the interbank exposure matrix"""
     from backend.services.simulation_service import build_exposure_matrix
-    
-    banks = Bank.query.all()
-    
-    if not banks:
+
+    cached = _exposure_cache.get(_bank_version)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+
+    rows = Bank.query.with_entities(
+        Bank.name, Bank.interbank_assets, Bank.interbank_liabilities
+    ).all()
+
+    if not rows:
         return jsonify({"error": {"message": "No banks available"}}), 404
-    
-    # Convert to pandas DataFrame
-    data = pd.DataFrame([{
-        'Bank Name': bank.name,
-        'Interbank Assets (€B)': bank.interbank_assets,
-        'Interbank Liabilities (€B)': bank.interbank_liabilities
-    } for bank in banks])
-    
-    # Build exposure matrix
-    exposure_matrix = build_exposure_matrix(
-        data['Interbank Assets (€B)'], 
-        data['Interbank Liabilities (€B)']
-    )
-    
-    # Convert to list of lists for JSON serialization
-    matrix_data = exposure_matrix.tolist()
-    bank_names = [bank.name for bank in banks]
-    
-    return jsonify({
-        "bank_names": bank_names,
-        "exposure_matrix": matrix_data
-    }), 200
\ No newline at end of file
+
+    # Feed NumPy arrays straight to the matrix build; a DataFrame
+    # roundtrip here would just copy the two columns through pandas
+    bank_names = [row[0] for row in rows]
+    interbank_assets = np.fromiter((row[1] for row in rows), np.float64, count=len(rows))
+    interbank_liabilities = np.fromiter((row[2] for row in rows), np.float64, count=len(rows))
+
+    exposure_matrix = build_exposure_matrix(interbank_assets, interbank_liabilities)
+
+    # FP32 halves the payload and orjson serializes the ndarray directly,
+    # skipping the tolist() explosion into Python floats
+    matrix_f32 = exposure_matrix.astype(np.float32, copy=False)
+
+    if orjson is not None:
+        body = orjson.dumps(
+            {"bank_names": bank_names, "exposure_matrix": matrix_f32},
+            option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    else:
+        body = jsonify({
+            "bank_names": bank_names,
+            "exposure_matrix": matrix_f32.tolist()
+        }).get_data()
+
+    # Cache the serialized body so hits skip both the matrix build and
+    # the JSON encode
+    _exposure_cache[_bank_version] = body
+
+    return Response(body, mimetype='application/json')
\ No newline at end of file
@@ -2,21 +2,110 @@
 Simulations API endpoints
 """
 
-from flask import Blueprint, request, jsonify, current_app, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, send_file, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from backend.models import iso_format
 from backend.models.simulation import Simulation, SimulationResult
 from backend.models.user import User
 from backend.models.bank import Bank
-from backend.services.simulation_service import run_simulation, validate_parameters
+from backend.services.simulation_service import run_simulation, validate_parameters, \
+    get_live_progress
 from backend.app import db
+from sqlalchemy import tuple_
+from sqlalchemy.orm import selectinload
+import base64
+import hashlib
+import logging
+import re
+import uuid
+import numpy as np
 import pandas as pd
 import io
 import csv
 import json
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 simulations_bp = Blueprint('simulations', __name__)
 
+# Columns the list view actually renders; projecting these instead of
+# hydrating full Simulation objects keeps the parameters JSON and error
+# text out of the page query. to_dict() stays for single-object endpoints.
+_LIST_COLUMNS = ('id', 'name', 'description', 'status', 'progress', 'created_at',
+                 'has_result')
+
+# Sortable columns for the list view
+_SORT_ALLOWED = {'created_at', 'name', 'status', 'progress'}
+
+# Upper bound on simulations per compare request
+_COMPARE_MAX_IDS = 20
+
+# Cheap shape check for date filters; matching first keeps malformed
+# input off the exception path, which is far slower than a regex miss
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+
+def _list_row_to_dict(row):
+    """Build the list payload dict from a projected simulation row"""
+    item = dict(zip(_LIST_COLUMNS, row))
+    item['created_at'] = iso_format(item['created_at'])
+    return item
+
+def _result_etag(simulation_id, result):
+    """Strong ETag for a completed simulation's results
+
+    Results are written once at completion, so (id, completed_at)
+    uniquely identifies the payload.
+    """
+    return hashlib.blake2b(
+        f"{simulation_id}:{result.completed_at.timestamp()}".encode(),
+        digest_size=16
+    ).hexdigest()
+
+def _is_admin():
+    """Authorize from the role claim embedded at login
+
+    Reading the claim avoids a second User round trip per request; the DB
+    fallback covers tokens minted before the claim existed.
+    """
+    claims = get_jwt()
+    if 'role' in claims:
+        return claims['role'] == 'admin'
+    user = db.session.get(User, get_jwt_identity())
+    return user is not None and user.role == 'admin'
+
+def _run_sync_fallback(app, simulation_id):
+    """Run the synchronous simulation fallback off the request thread
+
+    Executed on the app's sim_executor pool; pushes an app context since
+    the request context is gone by the time this runs.
+    """
+    from backend.services.simulation_service import run_simulation_sync
+    with app.app_context():
+        try:
+            result = run_simulation_sync(simulation_id)
+            error = result.get('error') if result else None
+        except Exception as sync_error:
+            # A failed flush leaves the session pending rollback; clear it
+            # before touching the row, or the status update below raises
+            db.session.rollback()
+            error = str(sync_error)
+        if error:
+            simulation = db.session.get(Simulation, simulation_id)
+            if simulation:
+                simulation.status = 'failed'
+                simulation.error_message = error
+                db.session.commit()
+
+def _log_sync_fallback_error(future):
+    """Surface executor failures that would otherwise vanish in the future"""
+    exc = future.exception()
+    if exc is not None:
+        logging.getLogger(__name__).error(f"Sync simulation fallback failed: {exc}")
+
 @simulations_bp.route('', methods=['GET'])
 @jwt_required()
 def get_simulations():
@@ -34,44 +123,96 @@ def get_simulations():
     if 'status' in request.args:
         query = query.filter_by(status=request.args['status'])
     
-    if 'search' in request.args:
-        search_term = f"%{request.args['search']}%"
+    search = request.args.get('search')
+    use_pg_search = search is not None and db.session.get_bind().dialect.name == 'postgresql'
+    if search and not use_pg_search:
+        # SQLite has no trigram support; an anchored prefix at least
+        # stays B-tree friendly instead of forcing a full scan, and its
+        # planner prefers the OR form over a union
+        search_term = f"{search}%"
         query = query.filter(Simulation.name.ilike(search_term) | Simulation.description.ilike(search_term))
     
-    # Filter by date range if provided
+    # Filter by date range if provided; malformed values are skipped
+    # silently, as before
     if 'start_date' in request.args:
-        try:
-            start_date = datetime.fromisoformat(request.args['start_date'])
-            query = query.filter(Simulation.created_at >= start_date)
-        except ValueError:
-            pass
-    
+        raw = request.args['start_date']
+        if _ISO_RE.match(raw):
+            query = query.filter(Simulation.created_at >= datetime.fromisoformat(raw))
+
     if 'end_date' in request.args:
-        try:
-            end_date = datetime.fromisoformat(request.args['end_date'])
+        raw = request.args['end_date']
+        if _ISO_RE.match(raw):
             # Add one day to include the end date
-            end_date = end_date + timedelta(days=1)
+            end_date = datetime.fromisoformat(raw) + timedelta(days=1)
             query = query.filter(Simulation.created_at < end_date)
-        except ValueError:
-            pass
     
-    # Apply sorting
+    # Keyset pagination: constant-time fetches at any depth and no
+    # COUNT(*) round trip. Requested via an opaque cursor; the page-based
+    # form below is kept for compatibility.
+    list_entities = tuple(getattr(Simulation, c) for c in _LIST_COLUMNS)
+    if use_pg_search:
+        # An OR of two ILIKEs keeps the Postgres planner off the
+        # per-column trigram indexes; separate branches combined with
+        # union() (deduplicating rows that match both columns) let each
+        # branch use its own index
+        search_term = f"%{search}%"
+        query = query.filter(Simulation.name.ilike(search_term)).with_entities(*list_entities).union(
+            query.filter(Simulation.description.ilike(search_term)).with_entities(*list_entities))
+    else:
+        query = query.with_entities(*list_entities)
+
+    if 'cursor' in request.args or 'limit' in request.args:
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        query = query.order_by(Simulation.created_at.desc(), Simulation.id.desc())
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                created_at_raw, _, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition('|')
+                cursor_tuple = (datetime.fromisoformat(created_at_raw), last_id)
+            except (ValueError, UnicodeDecodeError):
+                return jsonify({"error": {"message": "Invalid cursor"}}), 400
+            query = query.filter(tuple_(Simulation.created_at, Simulation.id) < cursor_tuple)
+
+        # Fetch one extra row to learn has_more without a COUNT
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = base64.urlsafe_b64encode(
+                f"{last.created_at.isoformat()}|{last.id}".encode()
+            ).decode()
+
+        return jsonify({
+            "simulations": [_list_row_to_dict(row) for row in rows],
+            "pagination": {
+                "limit": limit,
+                "has_more": has_more,
+                "next_cursor": next_cursor
+            }
+        }), 200
+
+    # Apply sorting (allow-listed so the ORDER BY always targets an
+    # indexed, sortable column)
     sort_by = request.args.get('sort_by', 'created_at')
+    if sort_by not in _SORT_ALLOWED:
+        sort_by = 'created_at'
     sort_dir = request.args.get('sort_dir', 'desc')
-    
+
     if sort_dir == 'desc':
         query = query.order_by(getattr(Simulation, sort_by).desc())
     else:
         query = query.order_by(getattr(Simulation, sort_by).asc())
-    
+
     # Paginate results
     paginated = query.paginate(page=page, per_page=per_page)
-    
+
     # Format response
-    simulations = []
-    for sim in paginated.items:
-        simulations.append(sim.to_dict())
-    
+    simulations = [_list_row_to_dict(row) for row in paginated.items]
+
     return jsonify({
         "simulations": simulations,
         "pagination": {
@@ -93,18 +234,12 @@ def create_simulation():
     if not data.get('name'):
         return jsonify({"error": {"message": "Simulation name is required"}}), 400
     
-    # Get parameters with defaults from config
+    # Get parameters with defaults snapshotted at app creation
     # Check if parameters are nested under 'parameters' key or at top level
-    param_data = data.get('parameters', data)
-    
-    parameters = {
-        'shock_prob': param_data.get('shock_prob', current_app.config['DEFAULT_SHOCK_PROB']),
-        'n_sim': param_data.get('n_sim', current_app.config['DEFAULT_N_SIM']),
-        'systemic_threshold': param_data.get('systemic_threshold', current_app.config['DEFAULT_SYSTEMIC_THRESHOLD']),
-        'trad_lgd': param_data.get('trad_lgd', current_app.config['DEFAULT_TRAD_LGD']),
-        'bc_lgd': param_data.get('bc_lgd', current_app.config['DEFAULT_BC_LGD']),
-        'bc_liability_reduction': param_data.get('bc_liability_reduction', current_app.config['DEFAULT_BC_LIABILITY_REDUCTION'])
-    }
+    param_data = data.get('parameters') or data
+    defaults = current_app.extensions['sim_defaults']
+
+    parameters = {key: param_data.get(key, default) for key, default in defaults.items()}
     
     # Validate parameters
     validation_error = validate_parameters(parameters)
@@ -129,25 +264,27 @@ def create_simulation():
         # Try to use Celery task if available
         run_simulation.delay(new_simulation.id)
     except Exception as e:
-        # If Celery is not available, run synchronously for development
-        current_app.logger.warning(f"Celery task failed, running synchronously: {e}")
-        
+        if not current_app.config.get('SIM_SYNC_FALLBACK', True):
+            # Production refuses to tie up a request thread; surface the
+            # broker outage instead
+            current_app.logger.error(f"Celery task failed and fallback disabled: {e}")
+            new_simulation.status = 'failed'
+            new_simulation.error_message = "Task queue unavailable"
+            db.session.commit()
+            return jsonify({"error": {"message": "Simulation queue unavailable"}}), 503
+
+        # If Celery is not available, run on the local executor so the
+        # request returns immediately instead of blocking for the run
+        current_app.logger.warning(f"Celery task failed, running on local executor: {e}")
+
         # Update status to running
         new_simulation.status = 'running'
         db.session.commit()
-        
-        # Run simulation synchronously (for development/testing)
-        from backend.services.simulation_service import run_simulation_sync
-        try:
-            result = run_simulation_sync(new_simulation.id)
-            if result.get('error'):
-                new_simulation.status = 'failed'
-                new_simulation.error_message = result['error']
-                db.session.commit()
-        except Exception as sync_error:
-            new_simulation.status = 'failed'
-            new_simulation.error_message = str(sync_error)
-            db.session.commit()
+
+        future = current_app.extensions['sim_executor'].submit(
+            _run_sync_fallback, current_app._get_current_object(), new_simulation.id
+        )
+        future.add_done_callback(_log_sync_fallback_error)
     
     return jsonify({
         "message": "Simulation created and queued",
@@ -160,16 +297,14 @@ def get_simulation(simulation_id):
     """Get a specific simulation"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     return jsonify({"simulation": simulation.to_dict()}), 200
 
@@ -178,24 +313,47 @@ def get_simulation(simulation_id):
 def get_simulation_status(simulation_id):
     """Get the status of a simulation"""
     current_user_id = get_jwt_identity()
-    
-    simulation = Simulation.query.get(simulation_id)
-    
-    if not simulation:
+
+    # Clients poll this endpoint repeatedly, so project just the columns
+    # it reports instead of hydrating the row with its parameters JSON
+    row = db.session.query(
+        Simulation.created_by, Simulation.status, Simulation.progress,
+        Simulation.status_message, Simulation.error_message
+    ).filter(Simulation.id == simulation_id).first()
+
+    if row is None:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
-    
+
+    created_by, status, progress, status_message, error_message = row
+
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
-    
-    return jsonify({
-        "status": simulation.status,
-        "progress": simulation.progress,
-        "status_message": simulation.status_message,
-        "error_message": simulation.error_message
-    }), 200
+    if created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
+
+    # While a run is in flight the database row only changes at phase
+    # transitions; overlay the fine-grained tick published to Redis
+    if status == 'running':
+        live = get_live_progress(simulation_id)
+        if live is not None and live[0] > progress:
+            progress = live[0]
+            if live[1]:
+                status_message = live[1]
+
+    # Unchanged polls collapse to a bodyless 304
+    etag = hashlib.blake2b(
+        f"{status}:{progress}:{status_message}".encode(), digest_size=8
+    ).hexdigest()
+    if request.if_none_match and etag in request.if_none_match:
+        return '', 304
+
+    response = jsonify({
+        "status": status,
+        "progress": progress,
+        "status_message": status_message,
+        "error_message": error_message
+    })
+    response.set_etag(etag)
+    return response, 200
 
 @simulations_bp.route('/<simulation_id>/results', methods=['GET'])
 @jwt_required()
@@ -203,16 +361,14 @@ def get_simulation_results(simulation_id):
     """Get the results of a simulation"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     # Check if simulation is completed
     if simulation.status != 'completed':
@@ -228,10 +384,26 @@ def get_simulation_results(simulation_id):
     if not result:
         return jsonify({"error": {"message": "Results not found"}}), 404
     
+    # Completed results never change, so a matching ETag can skip the
+    # serialization work entirely
+    etag = _result_etag(simulation_id, result)
+    if request.if_none_match and etag in request.if_none_match:
+        return '', 304
+
     # Check if raw data is requested
     include_raw_data = request.args.get('include_raw_data', 'false').lower() == 'true'
-    
-    return jsonify({"results": result.to_dict(include_raw_data=include_raw_data)}), 200
+
+    # Stream the blob cached at completion time when present; rows written
+    # before the cache columns existed fall back to to_dict()
+    body = result.full_json if include_raw_data else result.summary_json
+    if body is not None:
+        response = Response(b'{"results":' + body + b'}', mimetype='application/json')
+    else:
+        response = jsonify({"results": result.to_dict(include_raw_data=include_raw_data)})
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = 86400
+    return response, 200
 
 @simulations_bp.route('/<simulation_id>/parameters', methods=['PUT'])
 @jwt_required()
@@ -239,16 +411,14 @@ def update_simulation_parameters(simulation_id):
     """Update simulation parameters"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     # Check if simulation can be updated
     if simulation.status not in ['pending', 'failed']:
@@ -295,16 +465,14 @@ def cancel_simulation(simulation_id):
     """Cancel a running simulation"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     # Check if simulation can be canceled
     if simulation.status not in ['pending', 'running']:
@@ -334,16 +502,14 @@ def restart_simulation(simulation_id):
     """Restart a simulation"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     # Update simulation status
     simulation.status = 'pending'
@@ -367,26 +533,23 @@ def delete_simulation(simulation_id):
     """Delete a simulation"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
-    
-    if not simulation:
+    # Bulk DELETE with the ownership check folded into the WHERE clause:
+    # no hydration of the row (and its parameters JSON) just to discard it
+    query = Simulation.query.filter_by(id=simulation_id)
+    if not _is_admin():
+        query = query.filter_by(created_by=current_user_id)
+
+    # Delete associated results first; the FK cascade covers PostgreSQL
+    # but SQLite does not enforce it by default
+    SimulationResult.query.filter_by(simulation_id=simulation_id).delete(synchronize_session=False)
+    deleted = query.delete(synchronize_session=False)
+
+    if not deleted:
+        db.session.rollback()
         return jsonify({"error": {"message": "Simulation not found"}}), 404
-    
-    # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
-    
-    # Delete associated results first
-    result = SimulationResult.query.filter_by(simulation_id=simulation_id).first()
-    if result:
-        db.session.delete(result)
-    
-    # Delete simulation
-    db.session.delete(simulation)
+
     db.session.commit()
-    
+
     return jsonify({
         "message": "Simulation deleted successfully"
     }), 200
@@ -397,28 +560,51 @@ def compare_simulations():
     """Compare multiple simulations"""
     current_user_id = get_jwt_identity()
     
-    # Get simulation IDs from query parameters
-    simulation_ids = request.args.getlist('ids')
-    
+    # Get simulation IDs from query parameters, deduplicated in order
+    simulation_ids = list(dict.fromkeys(request.args.getlist('ids')))
+
     if not simulation_ids:
         return jsonify({"error": {"message": "No simulation IDs provided"}}), 400
-    
-    # Get simulations
+
+    # Bound and validate the list before touching the database so a
+    # pathological request cannot fan out into huge queries or payloads
+    if len(simulation_ids) > _COMPARE_MAX_IDS:
+        return jsonify({
+            "error": {"message": f"At most {_COMPARE_MAX_IDS} simulations can be compared"}
+        }), 400
+
+    for sim_id in simulation_ids:
+        try:
+            uuid.UUID(sim_id)
+        except ValueError:
+            return jsonify({"error": {"message": f"Invalid simulation ID: {sim_id}"}}), 400
+
+    # Batch-load everything up front: two round trips instead of two
+    # queries per compared simulation
+    sims_by_id = {
+        s.id: s for s in Simulation.query
+        .options(selectinload(Simulation.result))
+        .filter(Simulation.id.in_(simulation_ids)).all()
+    }
+    results_by_sim = {
+        r.simulation_id: r for r in SimulationResult.query
+        .filter(SimulationResult.simulation_id.in_(simulation_ids)).all()
+    }
+
     simulations = []
     results = []
-    
+
+    # Iterate the requested IDs to preserve the caller's ordering
     for sim_id in simulation_ids:
-        simulation = Simulation.query.get(sim_id)
-        
+        simulation = sims_by_id.get(sim_id)
+
         if not simulation:
             return jsonify({"error": {"message": f"Simulation {sim_id} not found"}}), 404
-        
+
         # Check if user has access to this simulation
-        if simulation.created_by != current_user_id:
-            user = User.query.get(current_user_id)
-            if not user or user.role != 'admin':
-                return jsonify({"error": {"message": f"Access denied for simulation {sim_id}"}}), 403
-        
+        if simulation.created_by != current_user_id and not _is_admin():
+            return jsonify({"error": {"message": f"Access denied for simulation {sim_id}"}}), 403
+
         # Check if simulation is completed
         if simulation.status != 'completed':
             return jsonify({
@@ -426,15 +612,19 @@ def compare_simulations():
                     "message": f"Simulation {sim_id} results not available (status: {simulation.status})"
                 }
             }), 400
-        
-        # Get the results
-        result = SimulationResult.query.filter_by(simulation_id=sim_id).first()
-        
+
+        result = results_by_sim.get(sim_id)
+
         if not result:
             return jsonify({"error": {"message": f"Results for simulation {sim_id} not found"}}), 404
-        
+
         simulations.append(simulation.to_dict())
-        results.append(result.to_dict())
+        # One parse of the cached blob instead of a json.loads per
+        # summary column inside to_dict()
+        if result.summary_json is not None:
+            results.append(json.loads(result.summary_json))
+        else:
+            results.append(result.to_dict())
     
     # Calculate comparison metrics
     comparison = calculate_comparison_metrics(results)
@@ -455,30 +645,35 @@ def get_simulation_history():
     days = request.args.get('days', 30, type=int)
     start_date = datetime.now() - timedelta(days=days)
     
-    # Get completed simulations in the time period
-    simulations = Simulation.query.filter(
+    # One JOIN with only the columns the payload needs, instead of a
+    # result query per simulation; skipping unused columns also avoids
+    # dragging the raw_data blob out of the database
+    rows = db.session.query(
+        Simulation.id, Simulation.name, Simulation.created_at, Simulation.parameters,
+        SimulationResult.traditional_summary, SimulationResult.blockchain_summary,
+        SimulationResult.improvements
+    ).join(
+        SimulationResult, SimulationResult.simulation_id == Simulation.id
+    ).filter(
         Simulation.created_by == current_user_id,
         Simulation.status == 'completed',
         Simulation.created_at >= start_date
     ).order_by(Simulation.created_at.asc()).all()
-    
-    # Get results for each simulation
+
     history_data = []
-    
-    for simulation in simulations:
-        result = SimulationResult.query.filter_by(simulation_id=simulation.id).first()
-        if result:
-            history_data.append({
-                'id': simulation.id,
-                'name': simulation.name,
-                'created_at': simulation.created_at.isoformat(),
-                'parameters': simulation.parameters,
-                'traditional_avg_failures': result.traditional_summary['average_failures'],
-                'blockchain_avg_failures': result.blockchain_summary['average_failures'],
-                'traditional_systemic_prob': result.traditional_summary['probability_systemic_event'],
-                'blockchain_systemic_prob': result.blockchain_summary['probability_systemic_event'],
-                'improvement_percent': result.improvements['probability_systemic_event']
-            })
+
+    for sim_id, name, created_at, parameters, trad_summary, bc_summary, improvements in rows:
+        history_data.append({
+            'id': sim_id,
+            'name': name,
+            'created_at': created_at.isoformat(),
+            'parameters': parameters,
+            'traditional_avg_failures': trad_summary['average_failures'],
+            'blockchain_avg_failures': bc_summary['average_failures'],
+            'traditional_systemic_prob': trad_summary['probability_systemic_event'],
+            'blockchain_systemic_prob': bc_summary['probability_systemic_event'],
+            'improvement_percent': improvements['probability_systemic_event']
+        })
     
     return jsonify({
         "history": history_data,
@@ -491,16 +686,14 @@ def export_simulation_results(simulation_id):
     """Export simulation results in various formats"""
     current_user_id = get_jwt_identity()
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Simulation not found"}}), 404
     
     # Check if user has access to this simulation
-    if simulation.created_by != current_user_id:
-        user = User.query.get(current_user_id)
-        if not user or user.role != 'admin':
-            return jsonify({"error": {"message": "Access denied"}}), 403
+    if simulation.created_by != current_user_id and not _is_admin():
+        return jsonify({"error": {"message": "Access denied"}}), 403
     
     # Check if simulation is completed
     if simulation.status != 'completed':
@@ -516,71 +709,96 @@ def export_simulation_results(simulation_id):
     if not result:
         return jsonify({"error": {"message": "Results not found"}}), 404
     
+    # Exports of a completed simulation are immutable too
+    etag = _result_etag(simulation_id, result)
+    if request.if_none_match and etag in request.if_none_match:
+        return '', 304
+
     # Get export format from query parameters
     export_format = request.args.get('format', 'json').lower()
     
     if export_format == 'json':
-        # Export as JSON
-        output = io.StringIO()
-        json.dump(result.to_dict(include_raw_data=True), output, indent=2)
-        output.seek(0)
-        
-        return output.getvalue(), 200, {
-            'Content-Type': 'application/json',
-            'Content-Disposition': f'attachment; filename=simulation_{simulation_id}.json'
-        }
-    
+        headers = {'Content-Disposition': f'attachment; filename=simulation_{simulation_id}.json'}
+
+        # Stream the blob cached at completion time when present
+        if result.full_json is not None:
+            return Response(result.full_json, mimetype='application/json', headers=headers)
+
+        # One C-level encode straight to bytes when orjson is available
+        if orjson is not None:
+            body = orjson.dumps(result.to_dict(include_raw_data=True),
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            return Response(body, mimetype='application/json', headers=headers)
+
+        # Otherwise stream the JSON out chunk-by-chunk instead of
+        # materializing the whole document (raw_data included) in memory
+        def generate_json():
+            encoder = json.JSONEncoder(indent=2)
+            for chunk in encoder.iterencode(result.to_dict(include_raw_data=True)):
+                yield chunk
+
+        return Response(stream_with_context(generate_json()), mimetype='application/json', headers=headers)
+
     elif export_format == 'csv':
-        # Export as CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Metric', 'Traditional', 'Blockchain', 'Improvement'])
-        
-        # Write data
-        writer.writerow(['Average Failures', 
-                        result.traditional_summary['average_failures'],
-                        result.blockchain_summary['average_failures'],
-                        f"{result.improvements['average_failures']}%"])
-        
-        writer.writerow(['Maximum Failures', 
-                        result.traditional_summary['max_failures'],
-                        result.blockchain_summary['max_failures'],
-                        result.improvements['max_failures']])
-        
-        writer.writerow(['Std Dev Failures', 
-                        result.traditional_summary['std_dev_failures'],
-                        result.blockchain_summary['std_dev_failures'],
-                        f"{result.improvements['std_dev_failures']}%"])
-        
-        writer.writerow(['Probability Systemic Event', 
-                        result.traditional_summary['probability_systemic_event'],
-                        result.blockchain_summary['probability_systemic_event'],
-                        f"{result.improvements['probability_systemic_event']}%"])
-        
-        # Write statistical analysis
-        writer.writerow([])
-        writer.writerow(['Statistical Analysis', 'Value'])
-        writer.writerow(['T-statistic', result.statistical_analysis['t_stat']])
-        writer.writerow(['P-value', result.statistical_analysis['p_value']])
-        writer.writerow(['Statistically Significant', 'Yes' if result.statistical_analysis['p_value'] < 0.05 else 'No'])
-        writer.writerow(['Effect Size (Cohen\'s d)', result.statistical_analysis['cohens_d']])
-        writer.writerow(['Effect Interpretation', result.statistical_analysis['effect']])
-        
-        # Write parameters
-        writer.writerow([])
-        writer.writerow(['Parameter', 'Value'])
-        for key, value in simulation.parameters.items():
-            writer.writerow([key, value])
-        
-        output.seek(0)
-        
-        return output.getvalue(), 200, {
-            'Content-Type': 'text/csv',
+        # Stream rows as they are formatted; a one-row StringIO is reused
+        # as the csv module's write target so peak memory stays O(1)
+        trad_summary = result.traditional_summary
+        bc_summary = result.blockchain_summary
+        improvements = result.improvements
+        statistical_analysis = result.statistical_analysis
+        parameters = simulation.parameters
+
+        def generate_csv():
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+
+            def row(values):
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow(values)
+                return buf.getvalue()
+
+            yield row(['Metric', 'Traditional', 'Blockchain', 'Improvement'])
+
+            yield row(['Average Failures',
+                       trad_summary['average_failures'],
+                       bc_summary['average_failures'],
+                       f"{improvements['average_failures']}%"])
+
+            yield row(['Maximum Failures',
+                       trad_summary['max_failures'],
+                       bc_summary['max_failures'],
+                       improvements['max_failures']])
+
+            yield row(['Std Dev Failures',
+                       trad_summary['std_dev_failures'],
+                       bc_summary['std_dev_failures'],
+                       f"{improvements['std_dev_failures']}%"])
+
+            yield row(['Probability Systemic Event',
+                       trad_summary['probability_systemic_event'],
+                       bc_summary['probability_systemic_event'],
+                       f"{improvements['probability_systemic_event']}%"])
+
+            # Statistical analysis
+            yield row([])
+            yield row(['Statistical Analysis', 'Value'])
+            yield row(['T-statistic', statistical_analysis['t_stat']])
+            yield row(['P-value', statistical_analysis['p_value']])
+            yield row(['Statistically Significant', 'Yes' if statistical_analysis['p_value'] < 0.05 else 'No'])
+            yield row(['Effect Size (Cohen\'s d)', statistical_analysis['cohens_d']])
+            yield row(['Effect Interpretation', statistical_analysis['effect']])
+
+            # Parameters
+            yield row([])
+            yield row(['Parameter', 'Value'])
+            for key, value in parameters.items():
+                yield row([key, value])
+
+        return Response(stream_with_context(generate_csv()), mimetype='text/csv', headers={
             'Content-Disposition': f'attachment; filename=simulation_{simulation_id}.csv'
-        }
-    
+        })
+
     else:
         return jsonify({"error": {"message": f"Unsupported export format: {export_format}"}}), 400
 
@@ -591,7 +809,7 @@ def get_shared_simulation(share_id):
     # For now, we'll just use the simulation ID as the share ID
     simulation_id = share_id
     
-    simulation = Simulation.query.get(simulation_id)
+    simulation = db.session.get(Simulation, simulation_id)
     
     if not simulation:
         return jsonify({"error": {"message": "Shared simulation not found"}}), 404
@@ -609,17 +827,32 @@ def get_shared_simulation(share_id):
     
     if not result:
         return jsonify({"error": {"message": "Shared results not found"}}), 404
-    
+
+    etag = _result_etag(simulation_id, result)
+    if request.if_none_match and etag in request.if_none_match:
+        return '', 304
+
     # Return limited information for shared results
-    return jsonify({
-        "simulation": {
-            "name": simulation.name,
-            "description": simulation.description,
-            "created_at": simulation.created_at.isoformat(),
-            "parameters": simulation.parameters
-        },
-        "results": result.to_dict(include_raw_data=False)
-    }), 200
+    simulation_info = {
+        "name": simulation.name,
+        "description": simulation.description,
+        "created_at": simulation.created_at.isoformat(),
+        "parameters": simulation.parameters
+    }
+    if result.summary_json is not None:
+        # Splice the cached result bytes around the small metadata dict
+        body = (b'{"simulation":' + current_app.json.dumps(simulation_info).encode()
+                + b',"results":' + result.summary_json + b'}')
+        response = Response(body, mimetype='application/json')
+    else:
+        response = jsonify({
+            "simulation": simulation_info,
+            "results": result.to_dict(include_raw_data=False)
+        })
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = 86400
+    return response, 200
 
 def calculate_comparison_metrics(results):
     """
@@ -633,60 +866,37 @@ def calculate_comparison_metrics(results):
     """
     if not results:
         return {}
-    
-    # Extract key metrics
-    trad_avg_failures = [r['traditional_summary']['average_failures'] for r in results]
-    bc_avg_failures = [r['blockchain_summary']['average_failures'] for r in results]
-    trad_systemic_prob = [r['traditional_summary']['probability_systemic_event'] for r in results]
-    bc_systemic_prob = [r['blockchain_summary']['probability_systemic_event'] for r in results]
-    
-    # Calculate ranges
-    trad_avg_range = max(trad_avg_failures) - min(trad_avg_failures)
-    bc_avg_range = max(bc_avg_failures) - min(bc_avg_failures)
-    trad_prob_range = max(trad_systemic_prob) - min(trad_systemic_prob)
-    bc_prob_range = max(bc_systemic_prob) - min(bc_systemic_prob)
-    
-    # Calculate averages
-    trad_avg_avg = sum(trad_avg_failures) / len(trad_avg_failures)
-    bc_avg_avg = sum(bc_avg_failures) / len(bc_avg_failures)
-    trad_prob_avg = sum(trad_systemic_prob) / len(trad_systemic_prob)
-    bc_prob_avg = sum(bc_systemic_prob) / len(bc_systemic_prob)
-    
+
+    n = len(results)
+
+    # Extract key metrics as typed arrays; min/max/mean then run as
+    # C-level reductions instead of interpreter loops over boxed floats
+    trad_avg_failures = np.fromiter(
+        (r['traditional_summary']['average_failures'] for r in results), dtype=np.float64, count=n)
+    bc_avg_failures = np.fromiter(
+        (r['blockchain_summary']['average_failures'] for r in results), dtype=np.float64, count=n)
+    trad_systemic_prob = np.fromiter(
+        (r['traditional_summary']['probability_systemic_event'] for r in results), dtype=np.float64, count=n)
+    bc_systemic_prob = np.fromiter(
+        (r['blockchain_summary']['probability_systemic_event'] for r in results), dtype=np.float64, count=n)
+
     # Calculate improvement consistency
-    improvements = [(1 - bc/trad) * 100 if trad > 0 else 0 for trad, bc in zip(trad_avg_failures, bc_avg_failures)]
-    avg_improvement = sum(improvements) / len(improvements)
-    min_improvement = min(improvements)
-    max_improvement = max(improvements)
-    
-    return {
-        'traditional_avg_failures': {
-            'min': min(trad_avg_failures),
-            'max': max(trad_avg_failures),
-            'avg': trad_avg_avg,
-            'range': trad_avg_range
-        },
-        'blockchain_avg_failures': {
-            'min': min(bc_avg_failures),
-            'max': max(bc_avg_failures),
-            'avg': bc_avg_avg,
-            'range': bc_avg_range
-        },
-        'traditional_systemic_prob': {
-            'min': min(trad_systemic_prob),
-            'max': max(trad_systemic_prob),
-            'avg': trad_prob_avg,
-            'range': trad_prob_range
-        },
-        'blockchain_systemic_prob': {
-            'min': min(bc_systemic_prob),
-            'max': max(bc_systemic_prob),
-            'avg': bc_prob_avg,
-            'range': bc_prob_range
-        },
-        'improvement': {
-            'min': min_improvement,
-            'max': max_improvement,
-            'avg': avg_improvement,
-            'range': max_improvement - min_improvement
+    with np.errstate(divide='ignore', invalid='ignore'):
+        improvements = np.where(trad_avg_failures > 0,
+                                (1 - bc_avg_failures / trad_avg_failures) * 100, 0.0)
+
+    def _stats(arr):
+        return {
+            'min': arr.min(),
+            'max': arr.max(),
+            'avg': arr.mean(),
+            'range': np.ptp(arr)
         }
+
+    return {
+        'traditional_avg_failures': _stats(trad_avg_failures),
+        'blockchain_avg_failures': _stats(bc_avg_failures),
+        'traditional_systemic_prob': _stats(trad_systemic_prob),
+        'blockchain_systemic_prob': _stats(bc_systemic_prob),
+        'improvement': _stats(improvements)
     }
\ No newline at end of file
@@ -3,13 +3,41 @@ Main Flask application for the Systemic Risk Dashboard
 """
 
 from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from werkzeug.exceptions import HTTPException
+from concurrent.futures import ThreadPoolExecutor
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C encoder
+
+    jsonify and response serialization go through here, so every JSON
+    endpoint benefits; OPT_SERIALIZE_NUMPY handles NumPy scalars and
+    arrays without intermediate Python conversion.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
@@ -26,7 +54,12 @@ def create_app(config_name='default'):
         Flask: Configured Flask application
     """
     app = Flask(__name__)
-    
+
+    # Serialize JSON with orjson when available (pure-Python fallback
+    # otherwise); result payloads are large enough for this to dominate
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Load configuration
     if config_name == 'testing':
         from backend.config import TestingConfig
@@ -38,8 +71,31 @@ def create_app(config_name='default'):
         from backend.config import DevelopmentConfig
         app.config.from_object(DevelopmentConfig)
     
+    # Snapshot the simulation parameter defaults once; request handlers
+    # read this plain dict instead of going through the config proxy
+    # six times per POST
+    app.extensions['sim_defaults'] = {
+        'shock_prob': app.config['DEFAULT_SHOCK_PROB'],
+        'n_sim': app.config['DEFAULT_N_SIM'],
+        'systemic_threshold': app.config['DEFAULT_SYSTEMIC_THRESHOLD'],
+        'trad_lgd': app.config['DEFAULT_TRAD_LGD'],
+        'bc_lgd': app.config['DEFAULT_BC_LGD'],
+        'bc_liability_reduction': app.config['DEFAULT_BC_LIABILITY_REDUCTION']
+    }
+
+    # Small pool for the synchronous simulation fallback so a broker
+    # outage never blocks request threads for the length of a run
+    app.extensions['sim_executor'] = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sim')
+
     # Enable CORS
     CORS(app)
+
+    # Compress large JSON/CSV responses; result payloads are highly
+    # compressible so this trades a little CPU for far fewer bytes
+    if Compress is not None:
+        app.config.setdefault('COMPRESS_MIMETYPES', ['application/json', 'text/csv'])
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        Compress(app)
     
     # Initialize extensions with app
     db.init_app(app)
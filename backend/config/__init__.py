@@ -5,10 +5,29 @@ Configuration settings for the Systemic Risk Dashboard
 import os
 from datetime import timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class Config:
     """Base configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-please-change-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # SQLAlchemy 2.x "insertmanyvalues": batched multi-row INSERTs with
+    # RETURNING in one round trip, even when PKs come from the database
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'insertmanyvalues_page_size': 1000
+    }
+    # Route the JSON column codecs through orjson when available; result
+    # raw_data blobs are megabytes of nested floats where the C encoder
+    # pays off most
+    if orjson is not None:
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'json_serializer': lambda obj: orjson.dumps(obj).decode(),
+            'json_deserializer': orjson.loads
+        })
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-dev-key-please-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
@@ -25,6 +44,10 @@ class Config:
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+    # Run simulations on a local thread pool when the Celery broker is
+    # unavailable (development convenience)
+    SIM_SYNC_FALLBACK = True
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
@@ -38,6 +61,9 @@ class TestingConfig(Config):
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
+    # Production must run simulations through the broker; failing loudly
+    # beats silently tying up a worker thread
+    SIM_SYNC_FALLBACK = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SECRET_KEY = os.environ.get('SECRET_KEY')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
@@ -2,13 +2,29 @@
 Database initialization script
 """
 
+import csv
+import io
 import os
+import uuid
 import pandas as pd
 from app import create_app, db
 from models.user import User
 from models.bank import Bank
 from werkzeug.security import generate_password_hash
 
+def gen_uuids(n):
+    """Generate n random UUID strings from a single urandom read
+
+    uuid.uuid4() pays a syscall per call; one os.urandom(16 * n) read
+    amortizes that across the batch, then the version/variant bits are
+    patched in place per RFC 4122.
+    """
+    buf = bytearray(os.urandom(16 * n))
+    for i in range(n):
+        buf[i * 16 + 6] = (buf[i * 16 + 6] & 0x0F) | 0x40
+        buf[i * 16 + 8] = (buf[i * 16 + 8] & 0x3F) | 0x80
+    return [str(uuid.UUID(bytes=bytes(buf[i * 16:i * 16 + 16]))) for i in range(n)]
+
 def init_db():
     """Initialize the database with default data"""
     app = create_app()
@@ -21,10 +37,17 @@ def init_db():
         admin = User.query.filter_by(username='admin').first()
         if not admin:
             print("Creating admin user...")
+            # Debug databases get wiped and reseeded constantly; a
+            # single-iteration PBKDF2 skips ~100ms of KDF per restart.
+            # Production seeding (and all real signups) keep the default cost.
+            if app.debug:
+                admin_hash = generate_password_hash('admin123', method='pbkdf2:sha256:1')
+            else:
+                admin_hash = generate_password_hash('admin123')
             admin = User(
                 username='admin',
                 email='admin@example.com',
-                password_hash=generate_password_hash('admin123'),
+                password_hash=admin_hash,
                 role='admin'
             )
             db.session.add(admin)
@@ -35,28 +58,62 @@ def init_db():
         if Bank.query.count() == 0:
             print("Loading bank data...")
             try:
-                # Try to load from CSV file
-                data = pd.read_csv('banks_data.csv')
-                
-                for _, row in data.iterrows():
-                    bank = Bank(
-                        name=row['Bank Name'],
-                        cet1_ratio=row['CET1 Ratio (%)'],
-                        total_assets=row['Total Assets (€B)'],
-                        interbank_assets=row['Interbank Assets (€B)'],
-                        interbank_liabilities=row['Interbank Liabilities (€B)']
-                    )
-                    
-                    # Calculate capital buffer if not in data
-                    if 'Capital Buffer (€B)' in row:
-                        bank.capital_buffer = row['Capital Buffer (€B)']
-                    else:
-                        bank.capital_buffer = bank.cet1_ratio * bank.total_assets * 0.01
-                    
-                    db.session.add(bank)
-                
-                db.session.commit()
-                print(f"Loaded {len(data)} banks.")
+                # float32 halves frame memory vs the float64 default;
+                # these are percentage / billion-euro values well inside
+                # float32 precision
+                dtypes = {
+                    'CET1 Ratio (%)': 'float32',
+                    'Total Assets (€B)': 'float32',
+                    'Interbank Assets (€B)': 'float32',
+                    'Interbank Liabilities (€B)': 'float32',
+                }
+                columns = ['id', 'name', 'cet1_ratio', 'total_assets',
+                           'interbank_assets', 'interbank_liabilities', 'capital_buffer']
+
+                # COPY FROM STDIN moves a whole chunk in one wire
+                # transfer instead of thousands of INSERT round trips
+                def psql_copy(pd_table, pd_conn, keys, data_iter):
+                    buf = io.StringIO()
+                    csv.writer(buf).writerows(data_iter)
+                    buf.seek(0)
+                    cols = ', '.join(f'"{k}"' for k in keys)
+                    with pd_conn.connection.cursor() as cursor:
+                        cursor.copy_expert(
+                            f'COPY {pd_table.name} ({cols}) FROM STDIN WITH CSV', buf)
+
+                total = 0
+                # Stream the file in 5000-row chunks so peak memory is one
+                # chunk, not the whole bank universe. Autoflush stays off
+                # so the count guard above can't trigger flushes mid-load.
+                with db.session.no_autoflush:
+                    for data in pd.read_csv('banks_data.csv', chunksize=5000,
+                                            dtype=dtypes):
+                        # Calculate capital buffer if not in data (one
+                        # vectorized column op instead of a branch per row)
+                        if 'Capital Buffer (€B)' not in data.columns:
+                            data['Capital Buffer (€B)'] = data['CET1 Ratio (%)'] * data['Total Assets (€B)'] * 0.01
+
+                        data = data.rename(columns={
+                            'Bank Name': 'name',
+                            'CET1 Ratio (%)': 'cet1_ratio',
+                            'Total Assets (€B)': 'total_assets',
+                            'Interbank Assets (€B)': 'interbank_assets',
+                            'Interbank Liabilities (€B)': 'interbank_liabilities',
+                            'Capital Buffer (€B)': 'capital_buffer'
+                        })
+                        data['id'] = gen_uuids(len(data))
+
+                        # One explicit BEGIN/COMMIT per chunk
+                        with db.engine.begin() as conn:
+                            if conn.dialect.name == 'postgresql':
+                                data[columns].to_sql('banks', conn, if_exists='append',
+                                                     index=False, method=psql_copy)
+                            else:
+                                # Multi-row VALUES batches for SQLite and friends
+                                data[columns].to_sql('banks', conn, if_exists='append',
+                                                     index=False, method='multi', chunksize=500)
+                        total += len(data)
+                print(f"Loaded {total} banks.")
             except Exception as e:
                 print(f"Error loading bank data: {str(e)}")
         
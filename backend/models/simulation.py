@@ -5,13 +5,48 @@ Simulation models
 import uuid
 from datetime import datetime
 import json
+from sqlalchemy import DDL, event, inspect
+from sqlalchemy.dialects import postgresql
 from backend.app import db
+from backend.models import iso_format
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Native JSON storage: JSONB on Postgres, plain JSON elsewhere. The
+# driver hands back dicts directly, so attribute access no longer pays a
+# json.loads per read
+_JSONType = db.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+# The trigram GIN indexes below need the pg_trgm operator classes, so
+# create the extension ahead of the tables; execute_if keeps the DDL off
+# SQLite, which has no extensions
+event.listen(
+    db.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
 
 class Simulation(db.Model):
     """Simulation model for storing simulation parameters and status"""
     
     __tablename__ = 'simulations'
-    
+    __table_args__ = (
+        # Trigram GIN indexes let Postgres serve '%term%' ILIKE searches
+        # instead of scanning the table; requires CREATE EXTENSION pg_trgm
+        db.Index('simulations_name_trgm_idx', 'name',
+                 postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('simulations_desc_trgm_idx', 'description',
+                 postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+        # Composite indexes backing the list view's filter/sort shapes;
+        # a DESC sort scans them backwards, so no direction modifier needed
+        db.Index('ix_sim_user_created', 'created_by', 'created_at'),
+        db.Index('ix_sim_user_status_created', 'created_by', 'status', 'created_at'),
+        # Serves admin dashboards that slice across all users by status
+        db.Index('ix_sim_status_created', 'status', 'created_at'),
+    )
+
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -21,21 +56,15 @@ class Simulation(db.Model):
     progress = db.Column(db.Float, nullable=False, default=0.0)
     status_message = db.Column(db.String(255), nullable=True)
     error_message = db.Column(db.Text, nullable=True)
-    _parameters = db.Column('parameters', db.Text, nullable=False)
-    
+    parameters = db.Column(_JSONType, nullable=False)
+    # Denormalized existence flag kept in sync by an after_insert hook on
+    # SimulationResult; lets to_dict answer has_result without lazily
+    # loading the (large) result row
+    has_result = db.Column(db.Boolean, nullable=False, default=False)
+
     # Relationships
     result = db.relationship('SimulationResult', backref='simulation', lazy=True, uselist=False)
     
-    @property
-    def parameters(self):
-        """Get parameters as dictionary"""
-        return json.loads(self._parameters)
-    
-    @parameters.setter
-    def parameters(self, value):
-        """Set parameters from dictionary"""
-        self._parameters = json.dumps(value)
-    
     def to_dict(self):
         """Convert simulation to dictionary"""
         return {
@@ -43,13 +72,13 @@ class Simulation(db.Model):
             'name': self.name,
             'description': self.description,
             'created_by': self.created_by,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': iso_format(self.created_at),
             'status': self.status,
             'progress': self.progress,
             'status_message': self.status_message,
             'error_message': self.error_message,
             'parameters': self.parameters,
-            'has_result': self.result is not None
+            'has_result': self.has_result
         }
     
     def __repr__(self):
@@ -60,66 +89,63 @@ class SimulationResult(db.Model):
     """SimulationResult model for storing simulation results"""
     
     __tablename__ = 'simulation_results'
-    
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    simulation_id = db.Column(db.String(36), db.ForeignKey('simulations.id'), nullable=False)
+
+    # Internal-only table, so the PK can be a plain 8-byte integer:
+    # denser index pages and no per-insert uuid4 call. User, Simulation
+    # and Bank keep their string UUIDs because those ids are part of the
+    # external API contract (cursors, share links, compare ids). SQLite
+    # needs the INTEGER variant: a BIGINT PK is not a rowid alias there
+    # and would never autoincrement.
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'),
+                   primary_key=True, autoincrement=True)
+    # Index the FK explicitly: SQLite creates no automatic index for
+    # foreign keys, and every result read filters on simulation_id
+    simulation_id = db.Column(db.String(36), db.ForeignKey('simulations.id', ondelete='CASCADE'),
+                              nullable=False, index=True)
     completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    _traditional_summary = db.Column('traditional_summary', db.Text, nullable=False)
-    _blockchain_summary = db.Column('blockchain_summary', db.Text, nullable=False)
-    _improvements = db.Column('improvements', db.Text, nullable=False)
-    _statistical_analysis = db.Column('statistical_analysis', db.Text, nullable=False)
-    _raw_data = db.Column('raw_data', db.Text, nullable=True)  # Optional for large datasets
-    
-    @property
-    def traditional_summary(self):
-        """Get traditional summary as dictionary"""
-        return json.loads(self._traditional_summary)
-    
-    @traditional_summary.setter
-    def traditional_summary(self, value):
-        """Set traditional summary from dictionary"""
-        self._traditional_summary = json.dumps(value)
-    
-    @property
-    def blockchain_summary(self):
-        """Get blockchain summary as dictionary"""
-        return json.loads(self._blockchain_summary)
-    
-    @blockchain_summary.setter
-    def blockchain_summary(self, value):
-        """Set blockchain summary from dictionary"""
-        self._blockchain_summary = json.dumps(value)
-    
-    @property
-    def improvements(self):
-        """Get improvements as dictionary"""
-        return json.loads(self._improvements)
-    
-    @improvements.setter
-    def improvements(self, value):
-        """Set improvements from dictionary"""
-        self._improvements = json.dumps(value)
-    
-    @property
-    def statistical_analysis(self):
-        """Get statistical analysis as dictionary"""
-        return json.loads(self._statistical_analysis)
-    
-    @statistical_analysis.setter
-    def statistical_analysis(self, value):
-        """Set statistical analysis from dictionary"""
-        self._statistical_analysis = json.dumps(value)
-    
-    @property
-    def raw_data(self):
-        """Get raw data as dictionary"""
-        return json.loads(self._raw_data) if self._raw_data else None
-    
-    @raw_data.setter
-    def raw_data(self, value):
-        """Set raw data from dictionary"""
-        self._raw_data = json.dumps(value) if value else None
-    
+    traditional_summary = db.Column(_JSONType, nullable=False)
+    blockchain_summary = db.Column(_JSONType, nullable=False)
+    improvements = db.Column(_JSONType, nullable=False)
+    statistical_analysis = db.Column(_JSONType, nullable=False)
+    # Optional for large datasets. Deferred: the per-iteration blob can be
+    # megabytes, and the summary read path should not drag it off disk —
+    # it is only fetched when the attribute is actually touched
+    raw_data = db.deferred(db.Column(_JSONType, nullable=True))
+    # Serialized read payloads cached at completion time; results are
+    # immutable once written, so read endpoints can stream these bytes
+    # instead of re-walking the nested dicts per request
+    # Deferred like raw_data: full_json carries the raw-data-sized blob,
+    # and the cached-bytes read paths load these attributes explicitly
+    summary_json = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    full_json = db.deferred(db.Column(db.LargeBinary, nullable=True))
+    
+    def precompute_json(self):
+        """Cache the serialized to_dict payloads on the row
+
+        Call after a flush so defaulted columns (id, completed_at) are
+        populated before they are baked into the blobs.
+        """
+        summary = self.to_dict(include_raw_data=False)
+        full = self.to_dict(include_raw_data=True)
+        if orjson is not None:
+            self.summary_json = orjson.dumps(summary)
+            self.full_json = orjson.dumps(full)
+        else:
+            self.summary_json = json.dumps(summary).encode()
+            self.full_json = json.dumps(full).encode()
+
+    def _has_raw_data(self):
+        """Answer whether raw_data exists without undeferring the blob
+
+        When the attribute is still deferred, probe IS NOT NULL on the
+        column instead of dragging the payload off disk just to discard it.
+        """
+        if 'raw_data' in inspect(self).unloaded:
+            return bool(db.session.query(
+                SimulationResult.raw_data.isnot(None)
+            ).filter(SimulationResult.id == self.id).scalar())
+        return self.raw_data is not None
+
     def to_dict(self, include_raw_data=False):
         """
         Convert simulation result to dictionary
@@ -130,18 +156,28 @@ class SimulationResult(db.Model):
         result = {
             'id': self.id,
             'simulation_id': self.simulation_id,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'completed_at': iso_format(self.completed_at),
             'traditional_summary': self.traditional_summary,
             'blockchain_summary': self.blockchain_summary,
             'improvements': self.improvements,
             'statistical_analysis': self.statistical_analysis,
-            'has_raw_data': self._raw_data is not None
+            'has_raw_data': self._has_raw_data()
         }
         
-        if include_raw_data and self._raw_data:
+        if include_raw_data and self.raw_data:
             result['raw_data'] = self.raw_data
         
         return result
     
     def __repr__(self):
-        return f'<SimulationResult {self.id}>'
\ No newline at end of file
+        return f'<SimulationResult {self.id}>'
+
+
+@event.listens_for(SimulationResult, 'after_insert')
+def _mark_simulation_has_result(mapper, connection, target):
+    """Flip the parent's has_result flag when a result row is written"""
+    connection.execute(
+        Simulation.__table__.update()
+        .where(Simulation.__table__.c.id == target.simulation_id)
+        .values(has_result=True)
+    )
\ No newline at end of file
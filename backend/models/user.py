@@ -5,7 +5,9 @@ User model
 import uuid
 import secrets
 from datetime import datetime, timedelta
+from sqlalchemy.orm import reconstructor
 from backend.app import db
+from backend.models import iso_format
 
 class User(db.Model):
     """User model for authentication and authorization"""
@@ -47,22 +49,31 @@ class User(db.Model):
         
         return True
     
+    @reconstructor
+    def _init_on_load(self):
+        """Parse the revoked-token string once per load, not per check"""
+        self._revoked_set = set(self.revoked_tokens.split(',')) if self.revoked_tokens else set()
+
     def add_revoked_token(self, jti):
         """Add a JWT token to the revoked tokens list"""
-        if self.revoked_tokens:
-            tokens = self.revoked_tokens.split(',')
-            tokens.append(jti)
-            # Keep only the last 10 tokens to prevent the field from growing too large
-            self.revoked_tokens = ','.join(tokens[-10:])
-        else:
-            self.revoked_tokens = jti
-    
+        tokens = self.revoked_tokens.split(',') if self.revoked_tokens else []
+        tokens.append(jti)
+        # Keep only the last 10 tokens to prevent the field from growing too large
+        tokens = tokens[-10:]
+        self.revoked_tokens = ','.join(tokens)
+        self._revoked_set = set(tokens)
+
     def is_token_revoked(self, jti):
         """Check if a JWT token is revoked"""
         if not self.revoked_tokens:
             return False
-        
-        return jti in self.revoked_tokens.split(',')
+
+        if not hasattr(self, '_revoked_set'):
+            # Instances created in this session skip the reconstructor
+            self._revoked_set = set(self.revoked_tokens.split(','))
+
+        # O(1) set membership instead of re-splitting the column per check
+        return jti in self._revoked_set
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -71,9 +82,22 @@ class User(db.Model):
             'username': self.username,
             'email': self.email,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'created_at': iso_format(self.created_at),
+            'last_login': iso_format(self.last_login)
         }
     
     def __repr__(self):
-        return f'<User {self.username}>'
\ No newline at end of file
+        return f'<User {self.username}>'
+
+
+class RevokedToken(db.Model):
+    """Revoked JWT model for indexed blocklist lookups by JTI"""
+
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
\ No newline at end of file
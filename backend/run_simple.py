@@ -5,86 +5,111 @@ Simplified backend startup for development
 
 import sys
 import os
-from flask import Flask, jsonify, request
+import json
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_bytes(payload):
+    """Serialize a payload to JSON bytes once"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+# Mock payloads are constant, so serialize them once at import and serve
+# the cached bytes instead of re-running jsonify per request
+_HEALTH_BYTES = _json_bytes({"status": "healthy", "message": "Backend is running!"})
+
+_SIMS_BYTES = _json_bytes({
+    "simulations": [
+        {
+            "id": 1,
+            "name": "Traditional Banking Simulation",
+            "status": "completed",
+            "created_at": "2025-01-20",
+            "systemic_failures": 15.2
+        },
+        {
+            "id": 2,
+            "name": "Blockchain Banking Simulation",
+            "status": "completed",
+            "created_at": "2025-01-20",
+            "systemic_failures": 8.7
+        }
+    ]
+})
+
+_BANKS_BYTES = _json_bytes({
+    "banks": [
+        {"id": 1, "name": "Bank A", "total_assets": 1000000},
+        {"id": 2, "name": "Bank B", "total_assets": 800000},
+        {"id": 3, "name": "Bank C", "total_assets": 1200000}
+    ]
+})
+
+# Template for the create response; only the name varies per request
+_CREATE_TEMPLATE = {
+    "id": 3,
+    "name": "New Simulation",
+    "status": "running",
+    "message": "Simulation started successfully"
+}
+
 def create_simple_app():
     """Create a simplified Flask app for development"""
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'dev-secret-key'
-    
+
     # Enable CORS for all routes
     CORS(app)
-    
+
     @app.route('/api/health')
     def health_check():
-        return jsonify({"status": "healthy", "message": "Backend is running!"})
-    
+        return Response(_HEALTH_BYTES, mimetype='application/json')
+
     @app.route('/api/simulations', methods=['GET'])
     def get_simulations():
         # Mock simulations data
-        return jsonify({
-            "simulations": [
-                {
-                    "id": 1,
-                    "name": "Traditional Banking Simulation",
-                    "status": "completed",
-                    "created_at": "2025-01-20",
-                    "systemic_failures": 15.2
-                },
-                {
-                    "id": 2,
-                    "name": "Blockchain Banking Simulation", 
-                    "status": "completed",
-                    "created_at": "2025-01-20",
-                    "systemic_failures": 8.7
-                }
-            ]
-        })
-    
+        return Response(_SIMS_BYTES, mimetype='application/json')
+
     @app.route('/api/simulations', methods=['POST'])
     def create_simulation():
         data = request.get_json()
-        return jsonify({
-            "id": 3,
-            "name": data.get('name', 'New Simulation'),
-            "status": "running",
-            "message": "Simulation started successfully"
-        })
-    
+        payload = dict(_CREATE_TEMPLATE)
+        payload['name'] = data.get('name', 'New Simulation')
+        return Response(_json_bytes(payload), mimetype='application/json')
+
     @app.route('/api/banks', methods=['GET'])
     def get_banks():
         # Mock banks data
-        return jsonify({
-            "banks": [
-                {"id": 1, "name": "Bank A", "total_assets": 1000000},
-                {"id": 2, "name": "Bank B", "total_assets": 800000},
-                {"id": 3, "name": "Bank C", "total_assets": 1200000}
-            ]
-        })
-    
+        return Response(_BANKS_BYTES, mimetype='application/json')
+
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({"error": "Endpoint not found"}), 404
-    
+
     @app.errorhandler(500)
     def internal_error(error):
         return jsonify({"error": "Internal server error"}), 500
-    
+
     return app
 
 if __name__ == '__main__':
     app = create_simple_app()
-    
+
     print("🚀 Starting Systemic Risk Dashboard Backend (Simplified)...")
     print("📍 Running on: http://localhost:5001")
     print("🔗 API Health Check: http://localhost:5001/api/health")
     print("📊 Mock API endpoints available:")
     print("   - GET /api/simulations")
-    print("   - POST /api/simulations") 
+    print("   - POST /api/simulations")
     print("   - GET /api/banks")
     print("\n💡 Press Ctrl+C to stop the server")
-    
+
     app.run(
         host='0.0.0.0',
         port=5001,
@@ -6,9 +6,16 @@ Enhanced backend with SQLite database integration
 import sys
 import os
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy.orm import selectinload
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add the parent directory to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,10 +25,25 @@ sys.path.append(project_root)
 db = SQLAlchemy()
 migrate = Migrate()
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson's C encoder"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 def create_app():
     """Create Flask app with SQLite database"""
     app = Flask(__name__)
-    
+
+    # orjson-backed jsonify when available (stdlib json otherwise)
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Configuration
     app.config['SECRET_KEY'] = 'dev-secret-key'
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///systemic_risk.db'
@@ -68,10 +90,15 @@ def create_app():
     @app.route('/api/banks', methods=['GET'])
     def get_banks():
         try:
-            banks = Bank.query.all()
+            # Core column SELECT: skips ORM instance construction and
+            # identity-map bookkeeping per row for a read-only listing
+            fields = ('id', 'name', 'cet1_ratio', 'total_assets',
+                      'interbank_assets', 'interbank_liabilities', 'capital_buffer')
+            rows = db.session.execute(
+                db.select(*(getattr(Bank, f) for f in fields))).all()
             return jsonify({
-                "banks": [bank.to_dict() for bank in banks],
-                "count": len(banks)
+                "banks": [dict(zip(fields, row)) for row in rows],
+                "count": len(rows)
             })
         except Exception as e:
             return jsonify({"error": str(e)}), 500
@@ -141,13 +168,21 @@ def create_app():
     @app.route('/api/simulations/<simulation_id>', methods=['GET'])
     def get_simulation(simulation_id):
         try:
-            simulation = Simulation.query.get_or_404(simulation_id)
+            # Eager-load the result relationship so the detail view is
+            # two round trips total instead of a lazy SELECT on access
+            simulation = db.session.execute(
+                db.select(Simulation)
+                .options(selectinload(Simulation.result))
+                .where(Simulation.id == simulation_id)
+            ).scalar_one_or_none()
+            if simulation is None:
+                return jsonify({"error": "Resource not found"}), 404
             result = simulation.to_dict()
-            
+
             # Include result data if available
             if simulation.result:
                 result['result'] = simulation.result.to_dict()
-            
+
             return jsonify(result)
         except Exception as e:
             return jsonify({"error": str(e)}), 500
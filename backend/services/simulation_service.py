@@ -5,6 +5,7 @@ Simulation service for running Monte Carlo simulations
 import numpy as np
 import pandas as pd
 from scipy import stats
+import os
 import time
 import json
 from celery import Celery
@@ -13,9 +14,21 @@ from backend.app import db
 from backend.models.simulation import Simulation, SimulationResult
 from backend.models.bank import Bank
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
 # Initialize Celery
 celery = Celery(__name__)
 
+# Fine-grained progress ticks are published here and read back by the
+# status endpoint; entries expire on their own after a run finishes
+_redis_client = redis.Redis.from_url(
+    os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+) if redis is not None else None
+_PROGRESS_TTL = 3600
+
 @celery.task
 def run_simulation(simulation_id):
     """
@@ -91,7 +104,8 @@ def run_simulation(simulation_id):
                 n_sim=params['n_sim'],
                 systemic_threshold=params['systemic_threshold'],
                 model_type="Traditional",
-                progress_callback=lambda p, m: update_progress(simulation_id, 0.2 + p * 0.3, m)
+                progress_callback=lambda p, m: update_progress(
+                    simulation_id, 0.2 + p * 0.3, m, persist=False)
             )
             
             # Run blockchain banking simulation
@@ -105,7 +119,8 @@ def run_simulation(simulation_id):
                 n_sim=params['n_sim'],
                 systemic_threshold=params['systemic_threshold'],
                 model_type="Blockchain",
-                progress_callback=lambda p, m: update_progress(simulation_id, 0.5 + p * 0.3, m)
+                progress_callback=lambda p, m: update_progress(
+                    simulation_id, 0.5 + p * 0.3, m, persist=False)
             )
             
             # Analyze results
@@ -116,8 +131,8 @@ def run_simulation(simulation_id):
             improvements = calculate_improvements(trad_summary, bc_summary)
             
             # Statistical analysis
-            trad_failures = [r[0] for r in trad_results]
-            bc_failures = [r[0] for r in bc_results]
+            trad_failures = trad_results[0]
+            bc_failures = bc_results[0]
             
             t_stat, p_value, cohens_d, effect = perform_statistical_analysis(trad_failures, bc_failures)
             
@@ -143,13 +158,17 @@ def run_simulation(simulation_id):
                     'significant': bool(p_value < 0.05)
                 },
                 raw_data={
-                    'traditional_failures': trad_failures[:1000],  # Limit to first 1000 for size
-                    'blockchain_failures': bc_failures[:1000],
+                    'traditional_failures': trad_failures[:1000].tolist(),  # Limit to first 1000 for size
+                    'blockchain_failures': bc_failures[:1000].tolist(),
                     'bank_names': data['Bank Name'].tolist()
                 }
             )
             
             db.session.add(result)
+            # Assign defaults, then cache the serialized payloads so read
+            # endpoints can stream the bytes without re-serializing
+            db.session.flush()
+            result.precompute_json()
             
             # Update simulation status
             simulation.status = 'completed'
@@ -277,8 +296,8 @@ def run_simulation_sync(simulation_id):
         improvements = calculate_improvements(trad_summary, bc_summary)
         
         # Statistical analysis
-        trad_failures = [r[0] for r in trad_results]
-        bc_failures = [r[0] for r in bc_results]
+        trad_failures = trad_results[0]
+        bc_failures = bc_results[0]
         
         t_stat, p_value, cohens_d, effect = perform_statistical_analysis(trad_failures, bc_failures)
         
@@ -306,13 +325,17 @@ def run_simulation_sync(simulation_id):
                 'significant': bool(p_value < 0.05)
             },
             raw_data={
-                'traditional_failures': trad_failures[:1000],  # Limit to first 1000 for size
-                'blockchain_failures': bc_failures[:1000],
+                'traditional_failures': trad_failures[:1000].tolist(),  # Limit to first 1000 for size
+                'blockchain_failures': bc_failures[:1000].tolist(),
                 'bank_names': data['Bank Name'].tolist()
             }
         )
         
         db.session.add(result)
+        # Assign defaults, then cache the serialized payloads so read
+        # endpoints can stream the bytes without re-serializing
+        db.session.flush()
+        result.precompute_json()
         
         # Update simulation status
         simulation.status = 'completed'
@@ -377,7 +400,7 @@ def validate_parameters(params):
     
     return None
 
-def update_progress(simulation_id, progress, message=None):
+def update_progress(simulation_id, progress, message=None, persist=True):
     """
     Update simulation progress
     
@@ -385,7 +408,24 @@ def update_progress(simulation_id, progress, message=None):
         simulation_id (str): ID of the simulation
         progress (float): Progress value between 0 and 1
         message (str): Optional status message
+        persist (bool): Also rewrite the database row; phase transitions
+            pass True, per-batch ticks inside the engines pass False
     """
+    # Every tick goes to Redis (one SETEX, no transaction); the database
+    # row is only rewritten at phase transitions so a run does not issue
+    # a commit per progress update
+    if _redis_client is not None:
+        try:
+            _redis_client.setex(
+                f'sim:{simulation_id}:progress', _PROGRESS_TTL,
+                f'{progress}|{message or ""}'
+            )
+        except redis.RedisError:
+            pass
+        if not persist:
+            return
+    # Without Redis, fall back to persisting every tick so polling
+    # clients still see movement between phases
     simulation = Simulation.query.get(simulation_id)
     if simulation:
         simulation.progress = progress
@@ -393,6 +433,31 @@ def update_progress(simulation_id, progress, message=None):
             simulation.status_message = message
         db.session.commit()
 
+def get_live_progress(simulation_id):
+    """
+    Read the most recent fine-grained progress tick from Redis
+
+    Args:
+        simulation_id (str): ID of the simulation
+
+    Returns:
+        tuple: (progress, message) or None when Redis is unavailable or
+            holds no tick for this simulation
+    """
+    if _redis_client is None:
+        return None
+    try:
+        raw = _redis_client.get(f'sim:{simulation_id}:progress')
+    except redis.RedisError:
+        return None
+    if not raw:
+        return None
+    progress, _, message = raw.decode().partition('|')
+    try:
+        return float(progress), message or None
+    except ValueError:
+        return None
+
 def build_exposure_matrix(assets, liabilities):
     """
     Build the interbank exposure matrix based on assets and liabilities
@@ -404,15 +469,16 @@ def build_exposure_matrix(assets, liabilities):
     Returns:
     numpy.ndarray: Exposure matrix where [i,j] represents bank i's exposure to bank j
     """
-    n = len(assets)
-    matrix = np.zeros((n, n))
-    total_assets = np.sum(assets)
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[i, j] = liabilities[i] * assets[j] / (total_assets - assets[i])
-    
+    assets = np.asarray(assets, dtype=np.float64)
+    liabilities = np.asarray(liabilities, dtype=np.float64)
+    total_assets = assets.sum()
+
+    # matrix[i, j] = liabilities[i] * assets[j] / (total_assets - assets[i])
+    # expressed as an outer product of the row and column factors
+    row_factor = liabilities / (total_assets - assets)
+    matrix = row_factor[:, None] * assets[None, :]
+    np.fill_diagonal(matrix, 0.0)
+
     return matrix
 
 def monte_carlo_sim(data, exposure_matrix, lgd, shock_prob, n_sim=10000, systemic_threshold=3, 
@@ -431,140 +497,126 @@ def monte_carlo_sim(data, exposure_matrix, lgd, shock_prob, n_sim=10000, systemi
     progress_callback (function): Callback function for progress updates
     
     Returns:
-    list: List of tuples (number of failures, systemic event boolean, failed banks)
+    tuple: (n_failures, systemic_events, failed_matrix) ndarrays - failure
+        count and systemic flag per simulation, plus the (n_sim, n_banks)
+        boolean failure mask
     """
     n_banks = len(data)
-    failures_record = []
-    
-    # Set random seed for reproducibility - use different seeds for different models
-    if model_type == "Traditional":
-        np.random.seed(42)
-    else:
-        np.random.seed(44)  # Different seed for blockchain to avoid identical results
-    
+
+
+    # Local Generator for reproducibility - different seed for blockchain to
+    # avoid identical results, without mutating the global NumPy RNG state
+    rng = np.random.default_rng(42 if model_type == "Traditional" else 44)
+
     # Adjust shock probability based on model type
     # Blockchain has better early warning systems, so initial shocks are less likely
     effective_shock_prob = shock_prob
     if model_type == "Blockchain":
         effective_shock_prob = shock_prob * 0.8  # 20% reduction in initial shock probability
-    
-    for sim in range(n_sim):
-        # Update progress every 100 simulations
-        if progress_callback and sim % 100 == 0:
-            progress_callback(sim / n_sim, f"Running {model_type} simulation {sim}/{n_sim}")
-        
-        # Step 1: Initial shock
-        failed = np.random.rand(n_banks) < effective_shock_prob
-        capital = data['Capital Buffer (€B)'].copy()
-        
-        # Track which banks failed in each round
-        failed_in_round = {0: np.where(failed)[0].tolist()}
-        round_num = 1
-        
-        # For blockchain, add additional capital buffer due to better risk management
-        if model_type == "Blockchain":
-            capital = capital * 1.1  # 10% increase in effective capital buffer
-        
-        still_failing = True
-        while still_failing:
-            losses = np.zeros(n_banks)
-            # For each failed bank, distribute losses
-            for i, is_failed in enumerate(failed):
-                if is_failed:
-                    # Apply the exposure matrix with LGD
-                    current_losses = exposure_matrix[i] * lgd
-                    
-                    # For blockchain model, add additional risk mitigation factors
-                    if model_type == "Blockchain":
-                        # Blockchain has better transparency and early warning systems
-                        # This reduces the contagion effect
-                        current_losses *= 0.6  # 40% reduction in contagion effect due to transparency
-                    
-                    losses += current_losses
-            
-            # In traditional banking, there's a chance of market panic amplifying losses
-            if model_type == "Traditional" and round_num > 1:
-                # Market panic factor increases with each round
-                panic_factor = 1.0 + (round_num * 0.1)  # 10% increase per round
-                losses = losses * panic_factor
-            
-            # Update capital buffer and check for new failures
-            new_failed = (losses > capital.values) & (~failed)
-            
-            # Record which banks failed in this round
-            if np.any(new_failed):
-                failed_in_round[round_num] = np.where(new_failed)[0].tolist()
-            
-            still_failing = np.any(new_failed)
-            failed = failed | new_failed
-            
-            # Reduce capital by losses
-            capital = capital - losses
-            
-            round_num += 1
-            
-            # Safety check - shouldn't need more than 10 rounds
-            if round_num > 10:
-                break
-        
-        # Record results
-        n_failures = np.sum(failed)
-        systemic_event = n_failures >= systemic_threshold
-        
-        # Record which banks failed
-        failed_banks = np.where(failed)[0].tolist()
-        
-        failures_record.append((n_failures, systemic_event, failed_banks, failed_in_round))
-    
+
+    # One bulk draw covers the initial shocks for every simulation
+    shock_draws = rng.random((n_sim, n_banks))
+
+    # Fold LGD into the exposure matrix once; for the blockchain model the
+    # contagion damping is constant too, so it is folded in as well
+    loss_scale = lgd
+    if model_type == "Blockchain":
+        # Blockchain has better transparency and early warning systems
+        # This reduces the contagion effect
+        loss_scale *= 0.6  # 40% reduction in contagion effect due to transparency
+    scaled_exposure = np.ascontiguousarray(exposure_matrix * loss_scale, dtype=np.float32)
+
+    # Starting capital is identical for every simulation; compute it once
+    # For blockchain, add additional capital buffer due to better risk management
+    capital0 = data['Capital Buffer (€B)'].to_numpy(dtype=np.float32)
+    if model_type == "Blockchain":
+        capital0 = (capital0 * 1.1).astype(np.float32)  # 10% increase in effective capital buffer
+
+    # Step 1: Initial shocks for every simulation at once
+    failed = shock_draws < effective_shock_prob
+    capital = np.broadcast_to(capital0, (n_sim, n_banks)).copy()
+
+    # Contagion rounds run across all simulations at once; paths whose
+    # cascade has settled drop out of the active mask
+    active = np.ones(n_sim, dtype=bool)
+    round_num = 1
+    while round_num <= 10:  # Safety check - shouldn't need more than 10 rounds
+        if progress_callback:
+            progress_callback(round_num / 10.0,
+                              f"Running {model_type} contagion round {round_num}")
+
+        # One matmul distributes the pre-scaled losses from every failed
+        # bank in every simulation
+        losses = failed.astype(np.float32) @ scaled_exposure
+
+        # In traditional banking, there's a chance of market panic amplifying
+        # losses; the panic factor increases with each round
+        if model_type == "Traditional" and round_num > 1:
+            losses *= 1.0 + (round_num * 0.1)  # 10% increase per round
+
+        # Update capital buffers and check for new failures, but only in
+        # simulations that are still cascading
+        act = active[:, None]
+        new_failed = (losses > capital) & ~failed & act
+        np.subtract(capital, losses, out=capital, where=act)
+
+        failed |= new_failed
+        active = new_failed.any(axis=1)
+        if not active.any():
+            break
+        round_num += 1
+
+    # Record results as flat arrays; downstream summaries and the raw-data
+    # slices consume these directly without per-simulation tuples
+    n_failures = failed.sum(axis=1)
+    systemic_events = n_failures >= systemic_threshold
+
     # Final progress update
     if progress_callback:
         progress_callback(1.0, f"Completed {model_type} simulation")
-    
-    return failures_record
+
+    return n_failures, systemic_events, failed
 
 def summarize_results(results, systemic_threshold):
     """
     Summarize the simulation results
     
     Parameters:
-    results (list): List of tuples (number of failures, systemic event boolean, failed banks)
+    results (tuple): (n_failures, systemic_events, failed_matrix) arrays as
+        returned by monte_carlo_sim
     systemic_threshold (int): Number of bank failures to consider a systemic event
-    
+
     Returns:
     dict: Summary statistics
     """
-    failures = [r[0] for r in results]
-    systemic_events = [r[1] for r in results]
-    
+    failures, systemic_events, failed_matrix = results
+    failures = failures.astype(np.int64, copy=False)
+
     # Calculate 95% confidence intervals
+    mean_failures = float(failures.mean())
     ci_lower, ci_upper = stats.norm.interval(
-        0.95, 
-        loc=np.mean(failures), 
+        0.95,
+        loc=mean_failures,
         scale=stats.sem(failures)
     )
+
+    # Frequency distribution via one counting pass instead of a
+    # list.count() scan per distinct failure count
+    pct = np.bincount(failures) * (100.0 / failures.size)
+    distribution = {str(i): float(p) for i, p in enumerate(pct)}
     
-    # Calculate frequency distribution
-    max_failures = max(failures)
-    distribution = {}
-    for i in range(max_failures + 1):
-        distribution[str(i)] = failures.count(i) / len(failures) * 100
-    
-    # Calculate bank failure frequencies
-    bank_failures = {}
-    for result in results:
-        for bank_idx in result[2]:  # result[2] contains the list of failed banks
-            bank_failures[str(bank_idx)] = bank_failures.get(str(bank_idx), 0) + 1
-    
-    for bank_idx in bank_failures:
-        bank_failures[bank_idx] = bank_failures[bank_idx] / len(results) * 100
+    # Calculate bank failure frequencies: column sums over the boolean
+    # failure mask, scaled once to percentages
+    freq = failed_matrix.sum(axis=0) * (100.0 / failures.size)
+    bank_failures = {str(i): float(f) for i, f in enumerate(freq) if f > 0}
     
     return {
-        'average_failures': float(np.mean(failures)),
+        'average_failures': mean_failures,
         'median_failures': float(np.median(failures)),
-        'max_failures': int(np.max(failures)),
-        'min_failures': int(np.min(failures)),
-        'std_dev_failures': float(np.std(failures)),
-        'probability_systemic_event': float(np.mean(systemic_events)),
+        'max_failures': int(failures.max()),
+        'min_failures': int(failures.min()),
+        'std_dev_failures': float(failures.std()),
+        'probability_systemic_event': float(systemic_events.mean()),
         'ci_lower': float(ci_lower),
         'ci_upper': float(ci_upper),
         'distribution': distribution,
@@ -598,8 +650,8 @@ def perform_statistical_analysis(trad_failures, bc_failures):
     Perform statistical analysis on simulation results
     
     Parameters:
-    trad_failures (list): List of failures from traditional banking simulation
-    bc_failures (list): List of failures from blockchain banking simulation
+    trad_failures (numpy.ndarray): Failure counts from traditional banking simulation
+    bc_failures (numpy.ndarray): Failure counts from blockchain banking simulation
     
     Returns:
     tuple: (t_statistic, p_value, cohens_d, effect_interpretation)
@@ -18,15 +18,16 @@ def build_exposure_matrix(assets, liabilities):
     Returns:
     numpy.ndarray: Exposure matrix where [i,j] represents bank i's exposure to bank j
     """
-    n = len(assets)
-    matrix = np.zeros((n, n))
-    total_assets = np.sum(assets)
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[i, j] = liabilities[i] * assets[j] / (total_assets - assets[i])
-    
+    assets = np.asarray(assets, dtype=np.float64)
+    liabilities = np.asarray(liabilities, dtype=np.float64)
+    total_assets = assets.sum()
+
+    # matrix[i, j] = liabilities[i] * assets[j] / (total_assets - assets[i])
+    # expressed as an outer product of the row and column factors
+    row_factor = liabilities / (total_assets - assets)
+    matrix = row_factor[:, None] * assets[None, :]
+    np.fill_diagonal(matrix, 0.0)
+
     return matrix
 
 def get_traditional_exposure_matrix(data, output_path=None):
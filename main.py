@@ -84,7 +84,8 @@ def main():
     trad_summary = analysis.summarize_results(trad_results)
     bc_summary = analysis.summarize_results(bc_results)
     improvements = analysis.calculate_improvements(trad_summary, bc_summary)
-    results_df = analysis.create_results_table(trad_summary, bc_summary, improvements)
+    results_table = analysis.create_results_table(trad_summary, bc_summary, improvements)
+    results_df = analysis.format_results_table(results_table)
     
     # Print results
     print("\n======================================================================")
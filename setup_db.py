@@ -12,6 +12,7 @@ from backend.models.user import User
 from backend.models.bank import Bank
 from werkzeug.security import generate_password_hash
 import pandas as pd
+import uuid
 
 def setup_database():
     """Set up database with sample data"""
@@ -61,17 +62,28 @@ def setup_database():
                 # Read the bank data CSV
                 data = pd.read_csv('/Users/mirasmujeeb/Desktop/Thesis/Nazu/Python/banks_data.csv')
                 
-                for _, row in data.iterrows():
-                    bank = Bank(
-                        name=row['Bank Name'],
-                        cet1_ratio=row['CET1 Ratio (%)'],
-                        total_assets=row['Total Assets (€B)'],
-                        interbank_assets=row['Interbank Assets (€B)'],
-                        interbank_liabilities=row['Interbank Liabilities (€B)'],
-                        capital_buffer=row['Capital Buffer (€B)']
+                # iterrows builds a Series per row; zipping the raw numpy
+                # columns feeds bulk_insert_mappings in one executemany
+                rows = [
+                    {
+                        'id': str(uuid.uuid4()),
+                        'name': n,
+                        'cet1_ratio': c,
+                        'total_assets': t,
+                        'interbank_assets': a,
+                        'interbank_liabilities': l,
+                        'capital_buffer': b,
+                    }
+                    for n, c, t, a, l, b in zip(
+                        data['Bank Name'].to_numpy(),
+                        data['CET1 Ratio (%)'].to_numpy(),
+                        data['Total Assets (€B)'].to_numpy(),
+                        data['Interbank Assets (€B)'].to_numpy(),
+                        data['Interbank Liabilities (€B)'].to_numpy(),
+                        data['Capital Buffer (€B)'].to_numpy(),
                     )
-                    db.session.add(bank)
-                
+                ]
+                db.session.bulk_insert_mappings(Bank, rows)
                 db.session.commit()
                 print(f"✅ Loaded {len(data)} banks")
             except Exception as e:
@@ -5,6 +5,74 @@ Monte Carlo simulation functions
 import numpy as np
 import config
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+# Paths processed per panel in the NumPy batch path; sized so one panel's
+# float32 working set is a few hundred KB and fits in L2 cache
+_PANEL_SIMS = 4096
+
+def _cascade_kernel(shocks, exposure_matrix, capital0, panic_step, fail_round):
+    """
+    Run the contagion cascade for every path, one path per parallel lane
+
+    Each lane's failure set is a uint64 bitset, so the caller must ensure
+    n_banks <= 64 (the dataset has ~15 European banks).
+
+    Parameters:
+    shocks (numpy.ndarray): Pre-drawn initial failure mask, shape (n_sim, n_banks)
+    exposure_matrix (numpy.ndarray): Interbank exposure matrix with LGD and any
+        contagion damping already folded in (float32, C-contiguous)
+    capital0 (numpy.ndarray): Starting capital buffer per bank (float32)
+    panic_step (float): Per-round panic increment (0.0 for Blockchain)
+    fail_round (numpy.ndarray): Output (n_sim, n_banks) int8, pre-filled with -1;
+        set to the round each bank failed in
+    """
+    n_sim, n_banks = shocks.shape
+    one = np.uint64(1)
+    zero = np.uint64(0)
+    for s in prange(n_sim):
+        capital = capital0.copy()
+        # The per-lane failure set lives in one uint64 bitset (bit j =
+        # bank j failed), so set updates and the cascade-settled check
+        # are single register operations instead of array traffic
+        failed_mask = zero
+        for j in range(n_banks):
+            if shocks[s, j]:
+                failed_mask |= one << np.uint64(j)
+                fail_round[s, j] = 0
+        round_num = 1
+        while round_num <= 10:
+            losses = np.zeros(n_banks)
+            for i in range(n_banks):
+                if (failed_mask >> np.uint64(i)) & one != zero:
+                    for j in range(n_banks):
+                        losses[j] += exposure_matrix[i, j]
+            factor = 1.0
+            if panic_step > 0.0 and round_num > 1:
+                factor = 1.0 + round_num * panic_step
+            new_mask = zero
+            for j in range(n_banks):
+                loss = losses[j] * factor
+                # Failure check reads the pre-decrement buffer, matching
+                # the batched version's update order
+                if loss > capital[j] and (failed_mask >> np.uint64(j)) & one == zero:
+                    new_mask |= one << np.uint64(j)
+                    fail_round[s, j] = round_num
+                capital[j] -= loss
+            failed_mask |= new_mask
+            if new_mask == zero:
+                break
+            round_num += 1
+
+# JIT-compile the cascade with one parallel lane per simulation path when
+# numba is available; the NumPy batch path below is used otherwise
+if njit is not None:
+    _cascade_kernel = njit(parallel=True, fastmath=True, cache=True)(_cascade_kernel)
+
 def monte_carlo_sim(data, exposure_matrix, lgd, shock_prob, n_sim=10000, model_type="Traditional"):
     """
     Run Monte Carlo simulation for systemic risk assessment
@@ -21,86 +89,108 @@ def monte_carlo_sim(data, exposure_matrix, lgd, shock_prob, n_sim=10000, model_t
     list: List of tuples (number of failures, systemic event boolean, failed banks)
     """
     n_banks = len(data)
-    failures_record = []
-    
-    # Set random seed for reproducibility - use different seeds for different models
-    if model_type == "Traditional":
-        np.random.seed(config.TRAD_SEED)
-    else:
-        np.random.seed(config.BC_SEED)
-    
+
+    # Local Generator for reproducibility - use different seeds for different
+    # models, without mutating the global NumPy RNG state other modules share
+    rng = np.random.default_rng(
+        config.TRAD_SEED if model_type == "Traditional" else config.BC_SEED
+    )
+
     # Adjust shock probability based on model type
     # Blockchain has better early warning systems, so initial shocks are less likely
     effective_shock_prob = shock_prob
     if model_type == "Blockchain":
         effective_shock_prob = shock_prob * config.BC_SHOCK_REDUCTION
-    
+
+    # Step 1: Initial shocks for every path in one bulk draw
+    failed = rng.random((n_sim, n_banks)) < effective_shock_prob
+
+    # Fold LGD (and the blockchain contagion damping, which is constant
+    # across rounds) into the matrix once; only the round-dependent panic
+    # factor remains a per-round scalar multiply. Single precision keeps
+    # the per-round matmul on SGEMM; downstream summaries work on integer
+    # failure counts, so no precision is lost in the statistics.
+    loss_scale = lgd
+    if model_type == "Blockchain":
+        # Blockchain has better transparency and early warning systems
+        # This reduces the contagion effect
+        loss_scale *= config.BC_CONTAGION_REDUCTION
+    exp_t = np.ascontiguousarray(exposure_matrix * loss_scale, dtype=np.float32)
+
+    # Per-path capital buffers
+    capital0 = data['Capital Buffer (€B)'].to_numpy(dtype=np.float32)
+    # For blockchain, add additional capital buffer due to better risk management
+    if model_type == "Blockchain":
+        capital0 = (capital0 * config.BC_CAPITAL_INCREASE).astype(np.float32)
+
+    # Round each bank failed in (-1 = survived); reconstructs the
+    # per-round failure record without per-path bookkeeping
+    fail_round = np.full((n_sim, n_banks), -1, dtype=np.int8)
+
+    if njit is not None and n_banks <= 64:
+        # Parallel JIT kernel: one prange lane per path. The kernel keeps
+        # its failure set in a uint64 bitset, so it handles up to 64 banks
+        panic = config.TRAD_PANIC_FACTOR if model_type == "Traditional" else 0.0
+        _cascade_kernel(failed, exp_t, capital0, panic, fail_round)
+        failed = fail_round >= 0
+    else:
+        fail_round[failed] = 0
+
+        # Walk the batch in panels of paths so the float32 working set
+        # (capital, losses and masks for one panel) stays cache-resident
+        # across all rounds instead of streaming the full batch each round.
+        # Panel slices are views, so updates land in the batch arrays.
+        for start in range(0, n_sim, _PANEL_SIMS):
+            failed_p = failed[start:start + _PANEL_SIMS]
+            rounds_p = fail_round[start:start + _PANEL_SIMS]
+            capital = np.broadcast_to(capital0, failed_p.shape).copy()
+
+            # Contagion rounds run across the whole panel at once; paths
+            # whose cascade has settled drop out of the active mask
+            active = np.ones(failed_p.shape[0], dtype=bool)
+            round_num = 1
+            while round_num <= 10:  # Safety cap - shouldn't need more than 10 rounds
+                # One matmul distributes losses from every failed bank in
+                # every path, replacing the per-path per-bank accumulation loop
+                losses = failed_p.astype(np.float32) @ exp_t
+                if model_type == "Traditional" and round_num > 1:
+                    # In traditional banking, market panic amplifies losses
+                    # and increases with each round
+                    losses *= 1.0 + (round_num * config.TRAD_PANIC_FACTOR)
+
+                # Update capital buffers and check for new failures, but only
+                # in paths still cascading (settled paths exited their loop
+                # already)
+                act = active[:, None]
+                new_failed = (losses > capital) & ~failed_p & act
+                np.subtract(capital, losses, out=capital, where=act)
+
+                rounds_p[new_failed] = round_num
+                failed_p |= new_failed
+
+                active = new_failed.any(axis=1)
+                if not active.any():
+                    break
+                round_num += 1
+
+    # Record results
+    n_failures_arr = failed.sum(axis=1)
+    systemic_arr = n_failures_arr >= config.SYSTEMIC_THRESHOLD
+    max_round = int(fail_round.max())
+
+    failures_record = []
     for sim in range(n_sim):
-        # Progress indicator
-        if sim % 1000 == 0 and sim > 0:
-            print(f"Completed {sim} simulations...")
-        
-        # Step 1: Initial shock
-        failed = np.random.rand(n_banks) < effective_shock_prob
-        capital = data['Capital Buffer (€B)'].copy()
-        
-        # Track which banks failed in each round
-        failed_in_round = {0: np.where(failed)[0].tolist()}
-        round_num = 1
-        
-        # For blockchain, add additional capital buffer due to better risk management
-        if model_type == "Blockchain":
-            capital = capital * config.BC_CAPITAL_INCREASE
-        
-        still_failing = True
-        while still_failing:
-            losses = np.zeros(n_banks)
-            # For each failed bank, distribute losses
-            for i, is_failed in enumerate(failed):
-                if is_failed:
-                    # Apply the exposure matrix with LGD
-                    current_losses = exposure_matrix[i] * lgd
-                    
-                    # For blockchain model, add additional risk mitigation factors
-                    if model_type == "Blockchain":
-                        # Blockchain has better transparency and early warning systems
-                        # This reduces the contagion effect
-                        current_losses *= config.BC_CONTAGION_REDUCTION
-                    
-                    losses += current_losses
-            
-            # In traditional banking, there's a chance of market panic amplifying losses
-            if model_type == "Traditional" and round_num > 1:
-                # Market panic factor increases with each round
-                panic_factor = 1.0 + (round_num * config.TRAD_PANIC_FACTOR)
-                losses = losses * panic_factor
-            
-            # Update capital buffer and check for new failures
-            new_failed = (losses > capital.values) & (~failed)
-            
-            # Record which banks failed in this round
-            if np.any(new_failed):
-                failed_in_round[round_num] = np.where(new_failed)[0].tolist()
-            
-            still_failing = np.any(new_failed)
-            failed = failed | new_failed
-            
-            # Reduce capital by losses
-            capital = capital - losses
-            
-            round_num += 1
-            
-            # Safety check - shouldn't need more than 10 rounds
-            if round_num > 10:
-                break
-        
-        # Record results
-        n_failures = np.sum(failed)
-        systemic_event = n_failures >= config.SYSTEMIC_THRESHOLD
-        
-        # Record which banks failed
-        failed_banks = np.where(failed)[0].tolist()
-        
-        failures_record.append((n_failures, systemic_event, failed_banks, failed_in_round))
-    
+        rounds = fail_round[sim]
+        failed_in_round = {0: np.flatnonzero(rounds == 0).tolist()}
+        for r in range(1, max_round + 1):
+            in_round = np.flatnonzero(rounds == r)
+            if in_round.size:
+                failed_in_round[r] = in_round.tolist()
+        failures_record.append((
+            int(n_failures_arr[sim]),
+            bool(systemic_arr[sim]),
+            np.flatnonzero(failed[sim]).tolist(),
+            failed_in_round
+        ))
+
     return failures_record
\ No newline at end of file